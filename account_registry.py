@@ -0,0 +1,130 @@
+"""Client account registry with typo-tolerant lookup.
+
+Accounts, their industries, aliases and the priority order of the dropdown
+live in accounts.json. AccountRegistry loads the file once and builds:
+
+* the ordered ACCOUNTS / INDUSTRIES lists and the account -> industry map the
+  app has always used ("Select ..." placeholders first, "Others" last),
+* an alias table, so "J&J" or "T-Mobile" resolve to the canonical account,
+* a trigram index over names and aliases for fuzzy search: a query only
+  scores the entries sharing at least one trigram with it, which keeps
+  lookups well under a millisecond for hundreds of accounts.
+"""
+import json
+import os
+import re
+import unicodedata
+
+ACCOUNTS_FILE = os.environ.get(
+    "ACCOUNTS_FILE", os.path.join(os.path.dirname(os.path.abspath(__file__)), "accounts.json")
+)
+
+SELECT_ACCOUNT = "Select Account"
+SELECT_INDUSTRY = "Select Industry"
+OTHER_ACCOUNT = "Others"
+OTHER_INDUSTRY = "Other"
+
+# Minimum Dice similarity for a fuzzy match to count
+DEFAULT_MIN_SCORE = 0.3
+
+_NON_ALNUM = re.compile(r'[^0-9a-z]+')
+
+
+def normalize_account(name):
+    """Lookup key: case/accents/punctuation-insensitive ('T-Mobile' == 'tmobile', '&' == 'and')"""
+    text = unicodedata.normalize("NFKD", str(name or "")).encode("ascii", "ignore").decode("ascii")
+    text = text.casefold().replace("&", "and")
+    return _NON_ALNUM.sub("", text)
+
+
+def trigrams(key):
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class AccountRegistry:
+    """Accounts loaded from accounts.json plus alias and trigram indexes"""
+
+    def __init__(self, accounts, priority=(), source=None, mtime_ns=None):
+        self.source = source
+        self.mtime_ns = mtime_ns  # of the source file when it was read (None if not from a file)
+        self.industry_map = {SELECT_ACCOUNT: SELECT_INDUSTRY}
+        self.aliases = {}  # alias as written -> canonical account
+        for entry in accounts:
+            self.industry_map[entry["name"]] = entry.get("industry") or OTHER_INDUSTRY
+            for alias in entry.get("aliases", ()):
+                self.aliases[alias] = entry["name"]
+
+        self.priority = [name for name in priority if name in self.industry_map]
+        others = sorted(name for name in self.industry_map if name not in self.priority and name != SELECT_ACCOUNT)
+        others.append(OTHER_ACCOUNT)
+        self.industry_map[OTHER_ACCOUNT] = OTHER_INDUSTRY
+        self.others = others
+        self.accounts = [SELECT_ACCOUNT] + self.priority + others
+
+        industries = sorted(i for i in set(self.industry_map.values()) if i != SELECT_INDUSTRY)
+        if OTHER_INDUSTRY not in industries:
+            industries.append(OTHER_INDUSTRY)
+        self.industries = [SELECT_INDUSTRY] + industries
+
+        # Lookup keys: every account name and alias, normalized
+        self._keys = {}
+        for name in self.industry_map:
+            if name not in (SELECT_ACCOUNT, OTHER_ACCOUNT):
+                self._keys.setdefault(normalize_account(name), name)
+        for alias, name in self.aliases.items():
+            self._keys.setdefault(normalize_account(alias), name)
+        self._keys.pop("", None)
+        self._entries = list(self._keys.items())
+        self._grams = [trigrams(key) for key, _ in self._entries]
+        self._postings = {}
+        for entry_id, grams in enumerate(self._grams):
+            for gram in grams:
+                self._postings.setdefault(gram, []).append(entry_id)
+
+    @classmethod
+    def from_file(cls, path=ACCOUNTS_FILE):
+        mtime_ns = os.stat(path).st_mtime_ns  # before reading: an edit in between just means one more reload
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data.get("accounts", []), data.get("priority", []), source=path, mtime_ns=mtime_ns)
+
+    def resolve(self, name):
+        """Canonical account for an exact name or alias (ignoring case/punctuation), else None"""
+        if name in self.industry_map:
+            return name
+        return self._keys.get(normalize_account(name))
+
+    def search(self, query, limit=5, min_score=DEFAULT_MIN_SCORE):
+        """Best (account, score) matches for a possibly misspelled name or alias, best first"""
+        key = normalize_account(query)
+        if not key:
+            return []
+        exact = self._keys.get(key)
+        if exact is not None:
+            return [(exact, 1.0)]
+        query_grams = trigrams(key)
+        shared = {}
+        for gram in query_grams:
+            for entry_id in self._postings.get(gram, ()):
+                shared[entry_id] = shared.get(entry_id, 0) + 1
+        best = {}
+        for entry_id, common in shared.items():
+            score = 2.0 * common / (len(query_grams) + len(self._grams[entry_id]))
+            name = self._entries[entry_id][1]
+            if score >= min_score and score > best.get(name, 0.0):
+                best[name] = score
+        ranked = sorted(best.items(), key=lambda item: (-item[1], item[0]))
+        return ranked[:limit]
+
+    def industry_for(self, account):
+        """Industry of an account or alias; 'Other' when unknown"""
+        return self.industry_map.get(self.resolve(account), OTHER_INDUSTRY)
+
+    def stats(self):
+        return {"accounts": len(self.accounts) - 1, "industries": len(self.industries) - 1,
+                "aliases": len(self.aliases), "trigrams": len(self._postings), "source": self.source}
+
+
+def load_account_registry(path=ACCOUNTS_FILE):
+    return AccountRegistry.from_file(path)
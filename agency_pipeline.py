@@ -0,0 +1,276 @@
+"""Execution engine for the agencies configured in API_CONFIGS.
+
+Agencies run concurrently on a thread pool. An agency may declare
+"depends_on": [names] in its config; it is only started once those agencies
+have finished, and their outputs are what its prompt(problem, outputs)
+receives. Independent agencies therefore overlap instead of adding up.
+Agencies with "multiround_convo" > 1 refine their own answer over several
+rounds (see extract_agency).
+
+Nothing in here touches Streamlit: worker threads have no script context,
+so progress is reported back on the calling thread.
+"""
+import difflib
+import hashlib
+import json
+import os
+import queue
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from perf_trace import maybe_span
+from result_cache import make_cache_key, normalize_text
+from talos_client import CircuitOpenError
+from vocab_text import json_to_text, sanitize_text
+
+DEFAULT_MAX_WORKERS = 4
+# Stop multi-round conversations once consecutive rounds are this similar
+DEFAULT_CONVERGENCE = float(os.environ.get("TALOS_ROUND_CONVERGENCE", 0.95))
+
+# Where an agency's text came from
+SOURCE_API = "api"
+SOURCE_CACHE = "cache"
+SOURCE_STALE = "stale-cache"
+SOURCE_ERROR = "error"
+
+
+def agency_dependencies(api_configs):
+    """Map agency name -> set of agency names it depends on; validates the DAG"""
+    names = [cfg["name"] for cfg in api_configs]
+    if len(set(names)) != len(names):
+        raise ValueError("API_CONFIGS agency names must be unique")
+    deps = {cfg["name"]: set(cfg.get("depends_on", ())) for cfg in api_configs}
+    for name, required in deps.items():
+        unknown = required - deps.keys()
+        if unknown:
+            raise ValueError(f"Agency '{name}' depends on unknown agencies: {sorted(unknown)}")
+
+    # Kahn's algorithm: anything left over is part of a cycle
+    remaining = {name: set(required) for name, required in deps.items()}
+    while remaining:
+        ready = [name for name, required in remaining.items() if not required]
+        if not ready:
+            raise ValueError(f"Dependency cycle between agencies: {sorted(remaining)}")
+        for name in ready:
+            del remaining[name]
+        for required in remaining.values():
+            required.difference_update(ready)
+    return deps
+
+
+def agency_cache_key(api_cfg, problem_text, account, industry, dep_outputs=None):
+    """Result cache key for one agency call.
+
+    Agencies with dependencies also key on their upstream outputs, since
+    those are part of the prompt.
+    """
+    extra = []
+    if dep_outputs:
+        blob = json.dumps(dep_outputs, sort_keys=True, ensure_ascii=False)
+        extra.append(hashlib.sha256(blob.encode("utf-8")).hexdigest())
+    return make_cache_key(problem_text, account, industry, api_cfg["name"], api_cfg["url"], *extra)
+
+
+def extraction_key(api_cfg, full_context, dep_outputs=None):
+    """Single-flight key for a whole extraction: the normalized full_context,
+    the agency and its upstream outputs"""
+    parts = [normalize_text(full_context), api_cfg["name"], api_cfg["url"],
+             json.dumps(dep_outputs or {}, sort_keys=True, ensure_ascii=False)]
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+def fetch_goal(api_cfg, goal, cache_key, client, cache, headers, on_text=None, scheduler=None, on_queue=None):
+    """POST one agency_goal through the result cache and the resilient client.
+
+    When the config has "stream": True and on_text is given, the response is
+    read incrementally and on_text(piece) is called as text arrives.
+    With a RequestScheduler the call waits for its tenant/agency rate limit and
+    joins an identical request already in flight; on_queue(position) reports
+    the queue position while waiting (0 once the request is sent).
+
+    Returns (raw_text, source) where raw_text is the json_to_text payload, or
+    an error message when source is SOURCE_ERROR.
+    """
+    try:
+        raw_text = cache.get(cache_key) if cache is not None else None
+        if raw_text is not None:
+            return raw_text, SOURCE_CACHE
+
+        # Bounded timeouts + retry with backoff; raises CircuitOpenError to fail fast
+        def call():
+            if api_cfg.get("stream") and on_text is not None:
+                stream_headers = dict(headers, Accept="text/event-stream, application/json")
+                return client.stream_post(
+                    api_cfg["url"], stream_headers, {"agency_goal": goal, "stream": True}, on_text
+                )
+            resp = client.post(api_cfg["url"], headers, {"agency_goal": goal})
+            return resp.status_code, (resp.json() if resp.status_code == 200 else None)
+
+        if scheduler is not None:
+            # One bucket per tenant and agency; identical goals share one request
+            bucket_key = (headers.get("Tenant-ID", ""), api_cfg["name"])
+            status, payload = scheduler.run(cache_key, bucket_key, call, on_position=on_queue)
+        else:
+            status, payload = call()
+        if status == 200:
+            raw_text = json_to_text(payload)
+            # Only successful responses are cached (errors should be retried)
+            if cache is not None:
+                cache.set(cache_key, raw_text)
+            return raw_text, SOURCE_API
+        return f"API Error {status}", SOURCE_ERROR
+    except CircuitOpenError:
+        # Talos is failing: serve an expired cached result if we have one
+        stale_text = cache.get(cache_key, allow_stale=True) if cache is not None else None
+        if stale_text is not None:
+            return stale_text, SOURCE_STALE
+        return (f"Error: The {api_cfg['name']} service is temporarily unavailable. Please try again in a minute.",
+                SOURCE_ERROR)
+    except Exception as e:
+        return f"Error: {str(e)}", SOURCE_ERROR
+
+
+def refine_goal(base_goal, previous_text, round_no):
+    """agency_goal for round 2+: the original goal plus the previous round's answer"""
+    return (
+        f"{base_goal}\n\n"
+        f"Your previous answer (round {round_no - 1}):\n{previous_text}\n\n"
+        "Review the previous answer and return an improved version of it: keep the same "
+        "structure, fix incorrect definitions and add anything important that is missing."
+    )
+
+
+def text_similarity(a, b):
+    """Line-based similarity ratio in [0, 1] between two round outputs"""
+    if a == b:
+        return 1.0
+    return difflib.SequenceMatcher(None, a.splitlines(), b.splitlines(), autojunk=False).ratio()
+
+
+def extract_agency(api_cfg, full_context, dep_outputs, cache_key, client, cache, headers,
+                   on_round=None, on_chunk=None, convergence=DEFAULT_CONVERGENCE, tracer=None,
+                   scheduler=None, on_queue=None, singleflight=None, on_join=None):
+    """Run one agency, honouring its "multiround_convo" setting.
+
+    Round 1 sends prompt(problem, outputs); each later round sends the same
+    goal plus the previous round's json_to_text output. Rounds stop early once
+    two consecutive outputs are at least `convergence` similar, and every
+    round is cached on its own, so repeats of rounds 2-3 are free too.
+    on_round(round_no, rounds, text) is called after each successful round and,
+    for streaming configs, on_chunk(round_no, piece) as text arrives, then
+    on_chunk(round_no, None) once the round's response has ended (before its
+    on_round), so a partial last paragraph can be flushed.
+
+    Returns (text, source). Errors are returned as text (as the UI has always
+    shown them) rather than raised; if a later round fails, the last good
+    round is returned. With a PerfTracer, each round records a "talos_post"
+    (or "result_cache_hit") span and a "sanitize_text" span. scheduler and
+    on_queue are passed on to fetch_goal.
+
+    With a SingleFlight, concurrent extractions of the same normalized
+    full_context share one run: followers call on_join() and then wait for
+    the leader's (text, source) instead of sending their own requests.
+    """
+    if singleflight is not None:
+        def lead():
+            return extract_agency(api_cfg, full_context, dep_outputs, cache_key, client, cache, headers,
+                                  on_round, on_chunk, convergence, tracer, scheduler, on_queue)
+
+        key = extraction_key(api_cfg, full_context, dep_outputs)
+        return singleflight.do(key, lead, on_join)[0]
+
+    rounds = max(1, int(api_cfg.get("multiround_convo", 1) or 1))
+    base_goal = api_cfg["prompt"](full_context, dep_outputs)
+
+    def stream_to(round_no):
+        if on_chunk is None:
+            return None
+        return lambda piece: on_chunk(round_no, piece)
+
+    def timed_fetch(goal, key, round_no):
+        start = time.perf_counter()
+        result = fetch_goal(api_cfg, goal, key, client, cache, headers, stream_to(round_no), scheduler, on_queue)
+        if on_chunk is not None and api_cfg.get("stream"):
+            on_chunk(round_no, None)  # end of this round's stream
+        if tracer is not None:
+            stage = "result_cache_hit" if result[1] == SOURCE_CACHE else "talos_post"
+            tracer.record(stage, (time.perf_counter() - start) * 1000)
+        return result
+
+    raw_text, source = timed_fetch(base_goal, cache_key, 1)
+    if source == SOURCE_ERROR:
+        return raw_text, source
+    with maybe_span(tracer, "sanitize_text"):
+        text = sanitize_text(raw_text)
+    if on_round is not None:
+        on_round(1, rounds, text)
+
+    for round_no in range(2, rounds + 1):
+        round_key = hashlib.sha256(
+            f"{cache_key}:round{round_no}:{hashlib.sha256(raw_text.encode('utf-8')).hexdigest()}".encode("utf-8")
+        ).hexdigest()
+        goal = refine_goal(base_goal, raw_text, round_no)
+        next_raw, next_source = timed_fetch(goal, round_key, round_no)
+        if next_source == SOURCE_ERROR:
+            break  # keep the last good round (partial result)
+        with maybe_span(tracer, "sanitize_text"):
+            next_text = sanitize_text(next_raw)
+        if on_round is not None:
+            on_round(round_no, rounds, next_text)
+        converged = text_similarity(text, next_text) >= convergence
+        raw_text, text = next_raw, next_text
+        if next_source == SOURCE_STALE:
+            source = SOURCE_STALE
+        if converged:
+            break
+    return text, source
+
+
+def run_agencies(api_configs, run_agency, max_workers=DEFAULT_MAX_WORKERS, on_complete=None,
+                 on_event=None, poll_interval=0.1):
+    """Run every agency, respecting depends_on, and return {name: result}.
+
+    run_agency(api_cfg, dep_outputs, emit) is called on a worker thread;
+    dep_outputs holds the *text* of each dependency (results may be
+    (text, source) tuples) and emit(kind, payload) forwards intermediate
+    events. On the calling thread, on_event(name, kind, payload) receives those
+    events and on_complete(name, result, done, total) is called as each agency
+    finishes, e.g. to update placeholders and a progress bar.
+    """
+    deps = agency_dependencies(api_configs)
+    pending = {cfg["name"]: cfg for cfg in api_configs}
+    results = {}
+    total = len(pending)
+    events = queue.Queue()
+
+    def text_of(result):
+        return result[0] if isinstance(result, tuple) else result
+
+    def make_emit(name):
+        return lambda kind, payload=None: events.put((name, kind, payload))
+
+    def drain_events():
+        while True:
+            try:
+                name, kind, payload = events.get_nowait()
+            except queue.Empty:
+                return
+            if on_event is not None:
+                on_event(name, kind, payload)
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, total or 1))) as executor:
+        running = {}
+        while pending or running:
+            for name in [n for n in pending if deps[n] <= results.keys()]:
+                cfg = pending.pop(name)
+                dep_outputs = {d: text_of(results[d]) for d in sorted(deps[name])}
+                running[executor.submit(run_agency, cfg, dep_outputs, make_emit(name))] = name
+            done, _ = wait(running, timeout=poll_interval, return_when=FIRST_COMPLETED)
+            drain_events()
+            for future in done:
+                name = running.pop(future)
+                results[name] = future.result()
+                if on_complete is not None:
+                    on_complete(name, results[name], len(results), total)
+    drain_events()
+    return results
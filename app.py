@@ -1,11 +1,36 @@
 import streamlit as st
-import requests, json, os, re, time
-import random
+import os, re, time
 import hashlib
+import uuid
 from datetime import datetime, timedelta
 from io import BytesIO
 import unicodedata
 import pandas as pd
+from result_cache import open_result_cache, LRUCache
+from result_store import open_result_store
+from vocab_text import sanitize_text, ParagraphAccumulator
+from vocab_model import VocabularyDoc
+from vocab_export import VOCAB_EXPORT_FORMATS, build_vocab_body, build_vocab_export
+from feedback_store import FeedbackStore, FEEDBACK_COLUMNS
+from feedback_index import open_feedback_index
+from feedback_export import EXPORT_FORMATS, write_export, dataframe_chunks
+from talos_client import TalosClient, PooledTransport
+from talos_scheduler import RequestScheduler, SingleFlight
+from theme_assets import build_theme_bundle
+from perf_trace import PerfTracer
+from vocab_config import (
+    API_CONFIGS, ACCOUNT_REGISTRY, build_headers, build_full_context,
+)
+from account_registry import ACCOUNTS_FILE, load_account_registry
+from agency_pipeline import run_agencies, extract_agency, agency_cache_key, SOURCE_STALE
+from extraction_jobs import ExtractionJobs, JOB_FAILED
+
+try:
+    from streamlit.logger import get_logger
+except ImportError:
+    import logging
+    get_logger = logging.getLogger
+logger = get_logger(__name__)
 
 # Try to import streamlit_javascript (optional dependency)
 try:
@@ -19,17 +44,17 @@ except ImportError:
 # Use an absolute path for the feedback file to avoid working-dir issues
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 FEEDBACK_FILE = os.path.join(BASE_DIR, "feedback.csv")
+# Append-only store: one locked row append per submission (no read-modify-write)
+feedback_store = FeedbackStore(FEEDBACK_FILE)
 
 # Initialize feedback file if not present (with proper error handling for cloud hosting)
 try:
     if not os.path.exists(FEEDBACK_FILE):
-        # ADDED 'ProblemStatement' COLUMN
-        df = pd.DataFrame(columns=["Timestamp", "Name", "Email", "Feedback", "FeedbackType", "OffDefinitions", "Suggestions", "Account", "Industry", "ProblemStatement"])
-        df.to_csv(FEEDBACK_FILE, index=False)
+        feedback_store.ensure_file()
 except (PermissionError, OSError) as e:
     # On Streamlit Cloud, filesystem is read-only, so we'll use session state instead
     if 'feedback_data' not in st.session_state:
-        st.session_state.feedback_data = pd.DataFrame(columns=["Timestamp", "Name", "Email", "Feedback", "FeedbackType", "OffDefinitions", "Suggestions", "Account", "Industry", "ProblemStatement"])
+        st.session_state.feedback_data = pd.DataFrame(columns=FEEDBACK_COLUMNS)
 
 # Safe rerun helper: some Streamlit versions remove experimental_rerun
 def safe_rerun():
@@ -56,22 +81,18 @@ def safe_rerun():
     except Exception:
         pass
 
+# --- Per-session performance tracing (shown in the admin section) ---
+if 'perf_tracer' not in st.session_state:
+    st.session_state.perf_tracer = PerfTracer()
+perf_tracer = st.session_state.perf_tracer
+perf_tracer.start_rerun()
+rerun_started = time.perf_counter()
+
 # --- Theme toggle state ---
 if 'dark_mode' not in st.session_state:
     st.session_state.dark_mode = False
 
 # --- Theme toggle (capsule-style single-click selector) ---
-st.markdown('''
-<style>
-.st-theme-toggle-container { position: fixed; left: 18px; top: 18px; z-index: 10001; }
-/* Make the radio look capsule-like where possible */
-.st-theme-toggle-container .stRadio { width: 180px; }
-.st-theme-toggle-container .stRadio .css-1wy0on6 { display: flex; gap: 0; }
-.st-theme-toggle-container .stRadio label[data-baseweb="radio"] { flex: 1; }
-.st-theme-toggle-container .stRadio .stRadio > div > label { border-radius: 999px; padding: 6px 12px; border: 1px solid rgba(0,0,0,0.06); }
-</style>
-''', unsafe_allow_html=True)
-
 with st.container():
     col1, col2 = st.columns([1, 6])
     with col1:
@@ -86,114 +107,17 @@ with st.container():
 
     with col2:
         st.markdown('')
-if st.session_state.dark_mode:
-    st.markdown('''
-    <style>
-    :root {
-        --text-primary: #f3f4f6; /* light text */
-        --bg-card: #23272f;      /* dark card bg */
-        --text-light: #ffffff;  /* white text for colored badges */
-        --border-color: rgba(255,255,255,0.06);
-        --accent-orange: #ff6b35;
-        --musigma-red: #8b1e1e;
-        --accent-teal: #0ea5a4;
-    }
-    /* Dark overall background */
-    body, .stApp, .main {
-        background: linear-gradient(135deg, #0b0f14 0%, #18181b 50%, #23272f 100%) !important;
-        color: var(--text-primary) !important;
-    }
-    /* Make all main boxes use Mu-Sigma red gradient and white text for contrast */
-    .info-card, .qa-box, .problem-display, .vocab-display, .section-title-box, .score-badge, .dimension-box, .dimension-display-box {
-        background: linear-gradient(135deg, var(--musigma-red) 0%, var(--accent-orange) 100%) !important;
-        color: var(--text-light) !important;
-        border-color: rgba(255,255,255,0.06) !important;
-        box-shadow: 0 6px 30px rgba(0,0,0,0.45) !important;
-    }
-    /* Business problem text should be white in dark mode */
-    .problem-display, .problem-display p { color: var(--text-light) !important; }
-    /* Inputs use dark backgrounds with light text to match dark theme */
-    .stTextArea textarea, .stTextInput input, .stSelectbox > div > div, .stSelectbox [data-baseweb="select"] {
-        background: #1f2933 !important;
-        color: var(--text-light) !important;
-        border-color: rgba(255,255,255,0.06) !important;
-    }
-    .stButton > button {
-        background: linear-gradient(135deg, var(--musigma-red) 0%, var(--accent-orange) 100%) !important;
-        color: var(--text-light) !important;
-    }
-    /* Ensure headings and labels are readable */
-    h1, h2, h3, h4, h5, h6, .dimension-label, .qa-question, .score-badge *, .hardness-badge-hard, .hardness-badge-moderate, .hardness-badge-easy {
-        color: var(--text-light) !important;
-        text-shadow: 0 1px 4px rgba(0,0,0,0.6);
-    }
-    .theme-toggle-btn {
-        background: transparent !important;
-        color: var(--text-light) !important;
-        border-color: var(--text-light) !important;
-    }
-    .theme-toggle-btn:hover {
-        background: rgba(255,255,255,0.04) !important;
-    }
-    </style>
-    ''', unsafe_allow_html=True)
-else:
-    st.markdown('''
-    <style>
-    :root {
-        --text-primary: #1e293b;
-        --bg-card: #ffffff;
-        --text-light: #ffffff;
-        --border-color: rgba(139, 30, 30, 0.15);
-        --accent-orange: #ff6b35;
-        --musigma-red: #8b1e1e;
-    }
-    body, .stApp, .main {
-        background: linear-gradient(135deg, #fafafa 0%, #f5f5f5 50%, #eeeeee 100%) !important;
-        color: #1e293b !important;
-    }
-    /* Regular content cards: white background, dark text */
-    .info-card, .qa-box, .vocab-display, .section-title-box {
-        background: #fff !important;
-        color: var(--text-primary) !important;
-        border-color: #e5e7eb !important;
-        box-shadow: 0 2px 16px rgba(0,0,0,0.08) !important;
-    }
-    /* Business problem area stays white for readability */
-    .problem-display { background: #fff !important; color: var(--text-primary) !important; border-color: #e5e7eb !important; }
-
-    /* Branded boxes (scores & dimensions) use Mu-Sigma red gradient and white text in light mode too */
-    .score-badge, .dimension-box, .dimension-display-box {
-        background: linear-gradient(135deg, var(--musigma-red) 0%, var(--accent-orange) 100%) !important;
-        color: var(--text-light) !important;
-        border: 3px solid rgba(255,255,255,0.18) !important;
-        box-shadow: var(--shadow-xl) !important;
-    }
-    .score-badge *, .dimension-box *, .dimension-display-box * { color: var(--text-light) !important; }
-    .stTextArea textarea, .stTextInput input, .stSelectbox > div > div, .stSelectbox [data-baseweb="select"] {
-        background: #fff !important;
-        color: #1e293b !important;
-        border-color: #e5e7eb !important;
-    }
-    .stButton > button {
-        background: linear-gradient(135deg, #8b1e1e 0%, #ff6b35 100%) !important;
-        color: #fff !important;
-    }
-    h1, h2, h3, h4, h5, h6, .dimension-label, .qa-question, .score-badge *, .hardness-badge-hard, .hardness-badge-moderate, .hardness-badge-easy {
-        color: #1e293b !important;
-        text-shadow: none;
-    }
-    .theme-toggle-btn {
-        background: #fff !important;
-        color: #8b1e1e !important;
-        border-color: #8b1e1e !important;
-    }
-    .theme-toggle-btn:hover {
-        background: #ffe5e5 !important;
-        border-color: #ff6b35 !important;
-    }
-    </style>
-    ''', unsafe_allow_html=True)
+
+# --- Theme CSS: minified once per theme per process (see theme_assets.py) ---
+# The same bytes are sent on every rerun, so Streamlit's message cache lets the
+# browser reuse the stylesheet instead of receiving ~30 KB of CSS again.
+@st.cache_resource
+def get_theme_bundle(theme):
+    return build_theme_bundle(theme)
+
+with perf_tracer.span("css_inject"):
+    theme_bundle = get_theme_bundle("dark" if st.session_state.dark_mode else "light")
+    st.markdown(theme_bundle.html, unsafe_allow_html=True)
 
 
 # -----------------------------
@@ -206,1091 +130,6 @@ st.set_page_config(
     initial_sidebar_state="collapsed"
 )
 
-st.markdown("""
-<style>
-/* --- GOOGLE FONTS --- */
-@import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700;800;900&family=Space+Grotesk:wght@400;500;600;700;900&family=Poppins:wght@300;400;500;600;700;800;900&display=swap');
-
-/* --- HIDE DEFAULT STREAMLIT ELEMENTS --- */
-#MainMenu, footer, header { visibility: hidden; }
-.element-container:empty { display: none !important; }
-div[data-testid="stVerticalBlock"] > div:empty { display: none !important; }
-
-/* --- COLOR VARIABLES (MU-SIGMA BRAND) --- */
-:root {
-    --musigma-red: #8b1e1e;
-    --musigma-red-dark: #6b1515;
-    --musigma-red-light: #a52828;
-    --accent-orange: #ff6b35;
-    --accent-teal: #940d0d;
-    --accent-teal-light: #b81414;
-    --bg-gradient: linear-gradient(135deg, #8b1e1e 0%, #00000 100%);
-    --bg-card: #ffffff;
-    --text-primary: #1e293b;
-    --text-secondary: #64748b;
-    --text-light: #ffffff;
-    --border-color: rgba(139, 30, 30, 0.15);
-    --shadow-sm: 0 2px 8px rgba(0, 0, 0, 0.08);
-    --shadow-md: 0 4px 16px rgba(0, 0, 0, 0.12);
-    --shadow-lg: 0 8px 32px rgba(139, 30, 30, 0.25);
-    --shadow-xl: 0 16px 48px rgba(139, 30, 30, 0.35);
-    --shadow-glow: 0 0 30px rgba(255, 107, 53, 0.3);
-}
-
-/* --- SMOOTH ANIMATIONS --- */
-@keyframes fadeInUp {
-    from { opacity: 0; transform: translateY(40px); }
-    to { opacity: 1; transform: translateY(0); }
-}
-
-@keyframes fadeIn {
-    from { opacity: 0; }
-    to { opacity: 1; }
-}
-
-@keyframes shimmer {
-    0% { background-position: -1000px 0; }
-    100% { background-position: 1000px 0; }
-}
-
-@keyframes gradientFlow {
-    0% { background-position: 0% 50%; }
-    50% { background-position: 100% 50%; }
-    100% { background-position: 0% 50%; }
-}
-
-@keyframes slideInRight {
-    from { opacity: 0; transform: translateX(30px); }
-    to { opacity: 1; transform: translateX(0); }
-}
-
-@keyframes slideInLeft {
-    from { opacity: 0; transform: translateX(-30px); }
-    to { opacity: 1; transform: translateX(0); }
-}
-
-@keyframes scaleIn {
-    from { opacity: 0; transform: scale(0.9); }
-    to { opacity: 1; transform: scale(1); }
-}
-
-@keyframes rotate {
-    from { transform: rotate(0deg); }
-    to { transform: rotate(360deg); }
-}
-
-@keyframes pulse {
-    0%, 100% { transform: scale(1); }
-    50% { transform: scale(1.05); }
-}
-
-@keyframes borderGlow {
-    0%, 100% { box-shadow: 0 0 10px rgba(255, 107, 53, 0.3); }
-    50% { box-shadow: 0 0 25px rgba(255, 107, 53, 0.6); }
-}
-
-/* --- APP BACKGROUND --- */
-.main { 
-    font-family: 'Inter', sans-serif; 
-    background: linear-gradient(135deg, #fafafa 0%, #f5f5f5 50%, #eeeeee 100%);
-    background-attachment: fixed; 
-    min-height: 100vh; 
-    padding: 2rem 1rem;
-}
-.stApp { background: transparent; }
-
-/* --- MAIN PAGE TITLE --- */
-.page-title { 
-    background: linear-gradient(135deg, var(--musigma-red) 0%, var(--accent-orange) 100%);
-    background-size: 200% 200%;
-    animation: gradientFlow 6s ease infinite;
-    padding: 3.5rem 3rem; 
-    border-radius: 28px; 
-    text-align: center; 
-    margin-bottom: 3rem; 
-    box-shadow: var(--shadow-xl);
-    border: 3px solid rgba(255, 255, 255, 0.2);
-    position: relative;
-    overflow: hidden;
-}
-
-.page-title::before {
-    content: '';
-    position: absolute;
-    top: -50%;
-    left: -50%;
-    width: 200%;
-    height: 200%;
-    background: radial-gradient(circle, rgba(255,255,255,0.1) 0%, transparent 70%);
-    animation: rotate 30s linear infinite;
-}
-
-.page-title h1 { 
-    margin: 0; 
-    font-weight: 900; 
-    color: #ffffff !important;
-    font-size: 3.5rem;
-    letter-spacing: -1.5px;
-    text-shadow: 3px 3px 6px rgba(0,0,0,0.3);
-    position: relative;
-    z-index: 1;
-    font-family: 'Poppins', sans-serif;
-}
-
-.page-subtitle {
-    color: rgba(255,255,255,0.95) !important;
-    font-size: 1.25rem;
-    margin-top: 0.75rem;
-    font-weight: 400;
-    position: relative;
-    z-index: 1;
-    letter-spacing: 0.5px;
-}
-
-/* Decorative elements - STATIC */
-.title-decoration {
-    position: absolute;
-    font-size: 3rem;
-    opacity: 0.12;
-}
-
-.deco-1 { top: 25px; left: 40px; }
-.deco-2 { top: 35px; right: 50px; }
-.deco-3 { bottom: 30px; left: 60px; }
-.deco-4 { bottom: 25px; right: 70px; }
-
-/* Mu-Sigma Logo - FIXED POSITION */
-.musigma-logo {
-    position: fixed;
-    top: 20px;
-    right: 20px;
-    width: 95px;
-    height: 95px;
-    border-radius: 50%;
-    border: 3px solid var(--musigma-red);
-    box-shadow: 0 10px 40px rgba(139, 30, 30, 0.4);
-    z-index: 9999;
-    background: white;
-    opacity: 1;
-    overflow: hidden;
-    animation: fadeIn 1s ease-out;
-}
-
-.musigma-logo:hover { 
-    box-shadow: 0 15px 50px rgba(139, 30, 30, 0.6);
-    animation: borderGlow 2s ease-in-out infinite;
-}
-
-.musigma-logo img {
-    width: 100% !important;
-    height: 100% !important;
-    object-fit: contain !important;
-    padding: 12px;
-}
-
-/* --- SECTION HEADINGS (CENTERED) --- */
-h2, h3, h4, h5, h6,
-.stMarkdown h2, .stMarkdown h3, .stMarkdown h4, .stMarkdown h5, .stMarkdown h6,
-[data-testid="stMarkdownContainer"] h2,
-[data-testid="stMarkdownContainer"] h3,
-[data-testid="stMarkdownContainer"] h4,
-[data-testid="stMarkdownContainer"] h5,
-[data-testid="stMarkdownContainer"] h6 {
-    color: var(--text-primary) !important;
-    font-weight: 700 !important;
-    margin-top: 1.5rem !important;
-    margin-bottom: 1rem !important;
-    font-family: 'Space Grotesk', sans-serif !important;
-    text-align: center !important;
-}
-
-/* --- SECTION TITLE BOXES (CENTERED WITH GRADIENT) --- */
-
-.section-title-box {
-    /* Match the main title look: Mu-Sigma red -> accent orange gradient in all modes */
-    background: linear-gradient(135deg, var(--musigma-red) 0%, var(--accent-orange) 100%) !important;
-    border-radius: 20px;
-    padding: 2.5rem 3rem;
-    margin: 0.5rem 0 1rem 0 !important; /* Reduced top margin from 2.5rem to 0.5rem */
-    box-shadow: var(--shadow-lg) !important;
-    /* Explicitly disable decorative animations for section title boxes */
-    position: relative;
-    overflow: hidden;
-    text-align: center;
-}
-
-/* Remove shimmer overlay/animation for these boxes so headings remain fully visible */
-.section-title-box::before {
-    content: '';
-    position: absolute;
-    top: 0;
-    left: 0;
-    width: 0;
-    height: 0;
-    background: transparent !important;
-    animation: none !important;
-}
-
-.section-title-box h2,
-.section-title-box h3,
-.section-title-box h4 {
-    color: var(--text-light) !important; /* ensure white text in all themes */
-    margin: 0 !important;
-    font-weight: 900 !important;
-    font-size: 1.9rem !important;
-    font-family: 'Poppins', sans-serif !important;
-    position: relative;
-    z-index: 2;
-    text-align: center !important;
-    display: flex;
-    align-items: center;
-    justify-content: center;
-    gap: 0.75rem;
-}
-
-.section-icon {
-    font-size: 2rem;
-    display: inline-block;
-}
-
-/* --- INFO CARDS --- */
-.info-card { 
-    background: var(--bg-card);
-    border: 2px solid var(--border-color);
-    border-radius: 24px; 
-    padding: 2.5rem; 
-    margin-bottom: 2rem; 
-    box-shadow: var(--shadow-md);
-    transition: all 0.5s cubic-bezier(0.4, 0, 0.2, 1);
-    animation: fadeInUp 0.7s ease-out;
-    position: relative;
-}
-
-.info-card::before {
-    content: '';
-    position: absolute;
-    top: 0;
-    left: 0;
-    width: 5px;
-    height: 0;
-    background: linear-gradient(180deg, var(--musigma-red), var(--accent-orange), var(--accent-teal));
-    transition: height 0.6s cubic-bezier(0.4, 0, 0.2, 1);
-    border-radius: 24px 0 0 24px;
-}
-
-.info-card:hover::before {
-    height: 100%;
-}
-
-.info-card:hover { 
-    transform: translateY(-8px) scale(1.01); 
-    box-shadow: var(--shadow-xl);
-    border-color: var(--accent-orange);
-}
-
-.info-card p, .info-card li, .info-card span {
-    color: var(--text-primary) !important; 
-    line-height: 1.9;
-    font-size: 1.05rem;
-}
-
-.info-card h3, .info-card h4 {
-    color: var(--musigma-red) !important;
-    font-weight: 700 !important;
-    margin-bottom: 1.5rem !important;
-}
-
-/* --- PROBLEM DISPLAY --- */
-.problem-display { 
-    background: linear-gradient(135deg, #ffffff 0%, #f8fafc 100%);
-    border: 2px solid var(--border-color);
-    border-radius: 24px !important; 
-    padding: 2.5rem !important; 
-    margin-bottom: 2.5rem; 
-    box-shadow: var(--shadow-md);
-    animation: scaleIn 0.7s ease-out;
-    position: relative;
-    transition: all 0.4s ease;
-}
-
-.problem-display:hover {
-    box-shadow: var(--shadow-lg);
-    border-color: var(--accent-teal);
-}
-
-.problem-display::after {
-    content: '📋';
-    position: absolute;
-    top: 25px;
-    right: 25px;
-    font-size: 2.5rem;
-    opacity: 0.08;
-}
-
-.problem-display h4 { 
-    color: var(--musigma-red) !important; 
-    margin-top: 0; 
-    font-weight: 700; 
-    font-size: 1.5rem; 
-    margin-bottom: 1.5rem;
-    text-align: center !important;
-}
-
-.problem-display p { 
-    color: var(--text-primary) !important; 
-    line-height: 1.9;
-    font-size: 1.05rem;
-    margin: 0;
-}
-
-/* --- Q&A BOXES --- */
-.qa-box { 
-    background: var(--bg-card);
-    border: 2px solid var(--border-color);
-    border-radius: 20px; 
-    padding: 2.25rem; 
-    margin-bottom: 2rem; 
-    box-shadow: var(--shadow-md);
-    transition: all 0.5s cubic-bezier(0.4, 0, 0.2, 1);
-    animation: slideInRight 0.7s ease-out;
-    position: relative;
-    overflow: hidden;
-}
-
-.qa-box::after {
-    content: '';
-    position: absolute;
-    bottom: 0;
-    left: 0;
-    width: 0;
-    height: 4px;
-    background: linear-gradient(90deg, var(--musigma-red), var(--accent-orange), var(--accent-teal));
-    transition: width 0.6s cubic-bezier(0.4, 0, 0.2, 1);
-}
-
-.qa-box:hover::after {
-    width: 100%;
-}
-
-.qa-box:hover { 
-    transform: translateX(8px) translateY(-6px); 
-    box-shadow: var(--shadow-lg);
-    border-color: var(--accent-orange);
-}
-
-.qa-question { 
-    font-weight: 700; 
-    font-size: 1.2rem; 
-    color: inherit !important; 
-    margin-bottom: 1.5rem; 
-    line-height: 1.7; 
-    font-family: 'Space Grotesk', sans-serif;
-    display: flex;
-    align-items: flex-start;
-    gap: 0.75rem;
-}
-
-.qa-question::before {
-    content: '▸';
-    color: var(--accent-orange);
-    font-size: 1.5rem;
-    flex-shrink: 0;
-}
-
-.qa-answer { 
-    font-size: 1.05rem; 
-    line-height: 1.9; 
-    color: inherit !important; 
-    white-space: pre-wrap; 
-}
-
-/* --- SCORE BADGES --- */
-.score-badge { 
-    background: linear-gradient(135deg, var(--musigma-red) 0%, var(--accent-orange) 100%);
-    padding: 3.5rem; 
-    border-radius: 28px; 
-    text-align: center; 
-    color: var(--text-light); 
-    box-shadow: var(--shadow-xl);
-    animation: scaleIn 0.8s ease-out; 
-    min-height: 220px; 
-    display: flex; 
-    flex-direction: column; 
-    align-items: center; 
-    justify-content: center; 
-    border: 3px solid rgba(255, 255, 255, 0.2);
-    position: relative;
-    overflow: hidden;
-    transition: all 0.4s ease;
-}
-
-.score-badge:hover {
-    transform: scale(1.03);
-    box-shadow: var(--shadow-glow);
-}
-
-.score-badge::before {
-    content: '';
-    position: absolute;
-    width: 200%;
-    height: 200%;
-    background: radial-gradient(circle, rgba(255,255,255,0.15) 0%, transparent 70%);
-    animation: pulse 4s ease-in-out infinite;
-}
-
-.score-badge * { 
-    color: var(--text-light) !important;
-    position: relative;
-    z-index: 1;
-}
-
-/* --- HARDNESS BADGES --- */
-.hardness-badge-hard, 
-.hardness-badge-moderate, 
-.hardness-badge-easy { 
-    color: var(--text-light) !important; 
-    padding: 3.5rem; 
-    border-radius: 28px; 
-    font-size: 2.2rem; 
-    font-weight: 900; 
-    text-align: center; 
-    min-height: 220px; 
-    display: flex; 
-    flex-direction: column;
-    align-items: center; 
-    justify-content: center; 
-    animation: scaleIn 0.8s ease-out; 
-    border: 3px solid rgba(255, 255, 255, 0.2);
-    box-shadow: var(--shadow-xl);
-    position: relative;
-    overflow: hidden;
-    transition: all 0.4s ease;
-}
-
-.hardness-badge-hard:hover,
-.hardness-badge-moderate:hover,
-.hardness-badge-easy:hover {
-    transform: scale(1.03);
-}
-
-.hardness-badge-hard { 
-    background: linear-gradient(135deg, #c62828 0%, #8b0000 100%);
-}
-
-.hardness-badge-moderate { 
-    background: linear-gradient(135deg, #f57c00 0%, #e65100 100%);
-}
-
-.hardness-badge-easy { 
-    background: linear-gradient(135deg,#53c853 0%, #1d911d 100%);
-}
-
-/* --- DIMENSION BOXES --- */
-.dimension-box, 
-.dimension-display-box { 
-    color: var(--text-light) !important; 
-    padding: 3rem; 
-    border-radius: 24px; 
-    text-align: center; 
-    box-shadow: var(--shadow-md);
-    min-height: 200px; 
-    margin-bottom: 2rem; 
-    transition: all 0.5s cubic-bezier(0.4, 0, 0.2, 1);
-    animation: fadeInUp 0.8s ease-out; 
-    border: 3px solid rgba(255, 255, 255, 0.2);
-    position: relative;
-    overflow: hidden;
-}
-
-.dimension-box::before,
-.dimension-display-box::before {
-    content: '';
-    position: absolute;
-    width: 100%;
-    height: 100%;
-    background: radial-gradient(circle at top right, rgba(255,255,255,0.15) 0%, transparent 60%);
-    top: 0;
-    right: 0;
-}
-
-.dimension-box { 
-    background: linear-gradient(135deg, var(--musigma-red) 0%, var(--accent-orange) 100%);
-    cursor: pointer;
-}
-
-.dimension-box:hover { 
-    transform: translateY(-12px) scale(1.04); 
-    box-shadow: 0 20px 60px rgba(139, 30, 30, 0.4);
-    animation: borderGlow 2s ease-in-out infinite;
-}
-
-.dimension-display-box { 
-    background: linear-gradient(135deg, var(--musigma-red) 0%, var(--accent-orange) 100%);
-}
-
-.dimension-display-box:hover { 
-    transform: translateY(-8px) scale(1.02); 
-    box-shadow: var(--shadow-xl);
-}
-
-.dimension-score { 
-    font-size: 4rem; 
-    font-weight: 900; 
-    margin: 1.25rem 0; 
-    color: inherit !important; 
-    font-family: 'Poppins', sans-serif;
-    text-shadow: 3px 3px 6px rgba(0,0,0,0.3);
-    position: relative;
-    z-index: 1;
-}
-
-.dimension-label { 
-    font-size: 1.35rem; 
-    font-weight: 700; 
-    color: inherit !important; 
-    text-transform: uppercase; 
-    letter-spacing: 2px; 
-    font-family: 'Space Grotesk', sans-serif;
-    position: relative;
-    z-index: 1;
-}
-
-/* --- VOCABULARY DISPLAY --- */
-.vocab-display { 
-    background: var(--bg-card) !important; 
-    border: 2px solid var(--border-color);
-    border-radius: 24px; 
-    padding: 2.5rem; 
-    line-height: 1.7 !important; 
-    margin-top: 2rem;
-    color: var(--text-primary) !important;
-    font-size: 1.05rem;
-    max-height: 650px;
-    overflow-y: auto;
-    box-shadow: var(--shadow-md);
-    animation: slideInLeft 0.6s ease-out;
-}
-
-.vocab-display h4 {
-    color: var(--musigma-red) !important;
-    font-weight: 800 !important;
-    font-size: 1.8rem !important;
-    margin-bottom: 2rem !important;
-    text-align: center !important;
-}
-
-.vocab-display strong {
-    color: var(--accent-black) !important;
-    font-weight: 700 !important;
-}
-
-/* --- SCORE GRID & DIMENSION ITEM STYLES (theme-aware) --- */
-.scores-grid {
-    display: grid;
-    grid-template-columns: repeat(4, 1fr);
-    gap: 1rem;
-}
-.score-item {
-    padding: 0.75rem;
-    border-radius: 8px;
-    text-align: center;
-    background: rgba(255, 107, 53, 0.05);
-    color: var(--accent-orange);
-}
-.score-item strong { display:block; }
-.score-item .score-value { font-size: 1.2rem; font-weight: 700; color: var(--accent-orange); }
-
-.dim-item { 
-    padding: 1rem; 
-    margin-bottom: 0.75rem; 
-    background: rgba(255, 107, 53, 0.05); 
-    border-radius: 8px; 
-    border-left: 3px solid var(--accent-orange);
-}
-.dim-item strong { color: var(--accent-orange); font-size: 1.1rem; }
-.dim-item .dim-score { font-size: 1.5rem; font-weight: 700; color: var(--accent-orange); }
-
-.vocab-item {
-    margin-bottom: 1.25rem !important;
-    padding-bottom: 1.25rem !important;
-    border-bottom: 1px solid rgba(139, 30, 30, 0.1);
-    transition: all 0.3s ease;
-}
-
-.vocab-item:hover {
-    padding-left: 15px;
-    background: linear-gradient(90deg, rgba(139, 30, 30, 0.03) 0%, transparent 100%);
-    border-radius: 10px;
-}
-
-/* --- DIMENSION CLICK TEXT --- */
-.dimension-click-text {
-    color: var(--text-secondary) !important;
-    font-size: 1.1rem !important;
-    font-weight: 600 !important;
-    text-align: center;
-    margin-bottom: 3rem !important;
-    padding: 1.5rem;
-    background: linear-gradient(135deg, rgba(139, 30, 30, 0.05) 0%, rgba(255, 107, 53, 0.05) 100%);
-    border-radius: 16px;
-    border: 2px dashed var(--accent-orange);
-    animation: pulse 4s ease-in-out infinite;
-}
-
-/* --- STREAMLIT SELECT BOXES (FIXED) --- */
-.stSelectbox {
-    margin-bottom: 1rem;
-}
-
-.stSelectbox > label {
-    font-weight: 600 !important;
-    font-size: 1.05rem !important;
-    color: var(--text-primary) !important;
-    margin-bottom: 0.5rem !important;
-}
-
-.stSelectbox > div > div { 
-    background-color: var(--bg-card) !important; 
-    border: 2px solid var(--border-color) !important; 
-    border-radius: 16px !important; 
-    padding: 0.5rem 1rem !important; 
-    min-height: 48px !important; 
-    max-height: 48px !important;
-    box-shadow: var(--shadow-sm);
-    transition: all 0.3s ease; 
-}
-
-.stSelectbox > div > div:hover { 
-    border-color: var(--accent-purple) !important; 
-    box-shadow: 0 4px 12px rgba(124, 58, 237, 0.2);
-    transform: translateY(-2px); 
-}
-
-.stSelectbox [data-baseweb="select"] { 
-    background-color: transparent !important; 
-    min-height: 40px !important;
-    max-height: 40px !important;
-}
-
-.stSelectbox [data-baseweb="select"] > div {
-    color: var(--text-primary) !important;
-    font-size: 1rem !important;
-    font-weight: 500 !important;
-    padding: 0 !important;
-    white-space: nowrap !important;
-    overflow: hidden !important;
-    text-overflow: ellipsis !important;
-    max-width: 100% !important;
-}
-
-/* Fix for selected text visibility */
-div[data-baseweb="select"] > div:first-child {
-    white-space: nowrap !important;
-    overflow: hidden !important;
-    text-overflow: ellipsis !important;
-    max-width: 100% !important;
-    padding-right: 20px !important;
-}
-
-[data-baseweb="popover"] { 
-    background-color: var(--bg-card) !important; 
-    border-radius: 16px !important;
-    box-shadow: var(--shadow-lg) !important;
-    max-height: 300px !important;
-    overflow-y: auto !important;
-}
-
-ul[role="listbox"] { 
-    background-color: var(--bg-card) !important; 
-    border: 2px solid var(--border-color) !important; 
-    border-radius: 16px !important; 
-    max-height: 280px !important; 
-    overflow-y: auto !important; 
-    box-shadow: var(--shadow-lg);
-    padding: 0.5rem !important;
-}
-
-li[role="option"] { 
-    color: var(--text-primary) !important; 
-    background-color: transparent !important; 
-    padding: 10px 14px !important; 
-    font-size: 0.95rem !important; 
-    line-height: 1.5 !important; 
-    transition: all 0.2s ease;
-    border-radius: 10px !important;
-    margin: 2px 0 !important;
-    white-space: nowrap !important;
-    overflow: hidden !important;
-    text-overflow: ellipsis !important;
-}
-
-li[role="option"]:hover { 
-    background-color: rgba(124, 58, 237, 0.1) !important; 
-    color: var(--accent-purple) !important; 
-    transform: translateX(5px); 
-}
-
-li[role="option"][aria-selected="true"] { 
-    background-color: rgba(139, 30, 30, 0.15) !important; 
-    color: var(--musigma-red) !important; 
-    font-weight: 600 !important; 
-}
-
-/* --- TEXT AREAS & INPUTS --- */
-.stTextArea textarea, 
-.stTextInput input { 
-    background: var(--bg-card) !important; 
-    border: 2px solid var(--border-color) !important; 
-    border-radius: 16px !important; 
-    color: var(--text-primary) !important; 
-    font-size: 1.05rem !important; 
-    box-shadow: var(--shadow-sm);
-    transition: all 0.3s ease; 
-    padding: 1.25rem !important;
-    line-height: 1.7 !important;
-}
-
-.stTextArea textarea {
-    min-height: 180px !important;
-}
-
-.stTextArea textarea::placeholder,
-.stTextInput input::placeholder {
-    color: var(--text-secondary) !important;
-    opacity: 0.7 !important;
-}
-
-.stTextArea textarea:focus, 
-.stTextInput input:focus { 
-    border-color: var(--accent-orange) !important; 
-    box-shadow: 0 0 0 4px rgba(255, 107, 53, 0.1) !important;
-    outline: none !important;
-}
-
-/* --- BUTTONS --- */
-.stButton > button { 
-    background: linear-gradient(135deg, var(--musigma-red) 0%, var(--accent-orange) 100%);
-    color: #ffffff !important; 
-    border: none; 
-    border-radius: 16px; 
-    padding: 1.1rem 2.75rem; 
-    font-weight: 700; 
-    font-size: 1.1rem; 
-    box-shadow: var(--shadow-md);
-    transition: all 0.4s cubic-bezier(0.4, 0, 0.2, 1);
-    cursor: pointer;
-    position: relative;
-    overflow: hidden;
-}
-
-.stButton > button::before {
-    content: '';
-    position: absolute;
-    top: 50%;
-    left: 50%;
-    width: 0;
-    height: 0;
-    border-radius: 50%;
-    background: rgba(255,255,255,0.3);
-    transform: translate(-50%, -50%);
-    transition: width 0.6s, height 0.6s;
-}
-
-.stButton > button:hover::before {
-    width: 400px;
-    height: 400px;
-}
-
-.stButton > button:hover { 
-    transform: translateY(-4px) scale(1.02); 
-    box-shadow: 0 10px 30px rgba(139, 30, 30, 0.4);
-}
-
-.stButton > button:active { 
-    transform: translateY(-2px); 
-}
-
-/* Reduce gap between button and vocabulary section */
-.stButton {
-    margin-bottom: 0.5rem !important;
-}
-
-/* Reduce spacing in main block container */
-.block-container {
-    padding-top: 1rem !important;
-    padding-bottom: 1rem !important;
-}
-
-/* --- PROGRESS BAR --- */
-.stProgress > div > div { 
-    background: linear-gradient(90deg, var(--musigma-red), var(--accent-orange), var(--accent-teal)) !important; 
-    border-radius: 12px; 
-    height: 12px !important;
-}
-
-/* --- FUN FACT STYLING --- */
-.fun-fact {
-    background: linear-gradient(135deg, rgba(139, 30, 30, 0.05) 0%, rgba(255, 107, 53, 0.05) 100%);
-    padding: 1.5rem 2rem;
-    border-radius: 16px;
-    border-left: 4px solid var(--accent-orange);
-    margin-top: 1rem;
-    max-width: 600px;
-    margin-left: auto;
-    margin-right: auto;
-    animation: slideInRight 0.5s ease-out;
-}
-
-.fun-fact-title {
-    font-weight: 700;
-    color: var(--musigma-red);
-    font-size: 1.1rem;
-    margin-bottom: 0.5rem;
-}
-
-.fun-fact-text {
-    color: var(--text-secondary);
-    font-size: 1rem;
-    line-height: 1.6;
-}
-
-/* --- SCROLLBAR --- */
-::-webkit-scrollbar {
-    width: 12px;
-    height: 12px;
-}
-
-::-webkit-scrollbar-track {
-    background: rgba(139, 30, 30, 0.05);
-    border-radius: 12px;
-}
-
-::-webkit-scrollbar-thumb {
-    background: linear-gradient(180deg, var(--musigma-red), var(--accent-orange));
-    border-radius: 12px;
-    transition: background 0.3s ease;
-}
-
-::-webkit-scrollbar-thumb:hover {
-    background: linear-gradient(180deg, var(--musigma-red-dark), var(--accent-orange));
-}
-
-/* --- RESPONSIVE --- */
-@media (max-width: 768px) {
-    .page-title h1 {
-        font-size: 2.2rem;
-    }
-    
-    .section-title-box h2,
-    .section-title-box h3 {
-        font-size: 1.4rem !important;
-    }
-    
-    .dimension-score {
-        font-size: 3rem;
-    }
-    
-    .musigma-logo {
-        width: 75px;
-        height: 75px;
-    }
-}
-            /* Smaller, tighter titles/headings + box sizing */
-:root {
-    --heading-weight: 650;
-    --title-padding-y: 0.5rem;
-    --title-padding-x: 0.75rem;
-    --title-radius: 8px;
-
-    --space-1: 0.25rem;
-    --space-2: 0.5rem;
-    --space-3: 0.75rem;
-}
-
-/* Headings: reduce size, tighten line-height and margins */
-h1, h2, h3, .title, .heading, .card-title {
-    letter-spacing: -0.01em;
-    font-weight: var(--heading-weight);
-}
-
-h1 {
-    font-size: clamp(1.6rem, 1.2rem + 1.8vw, 2.2rem);
-    line-height: 1.15;
-    margin: 0 0 var(--space-2);
-}
-
-h2 {
-    font-size: clamp(1.3rem, 1.0rem + 1.2vw, 1.8rem);
-    line-height: 1.2;
-    margin: 0 0 var(--space-2);
-}
-
-h3 {
-    font-size: clamp(1.1rem, 0.95rem + 0.8vw, 1.4rem);
-    line-height: 1.25;
-    margin: 0 0 var(--space-1);
-}
-
-/* Title/heading "boxes": smaller padding and radius */
-.title-box,
-.heading-box,
-.card-header,
-.section-header {
-    display: flex;
-    align-items: center;
-    gap: var(--space-2);
-    padding: var(--title-padding-y) var(--title-padding-x);
-    border-radius: var(--title-radius);
-}
-
-.card-title {
-    font-size: clamp(1rem, 0.9rem + 0.5vw, 1.2rem);
-    margin: 0;
-}
-
-/* Hero and sections: reduce vertical space */
-.hero h1,
-.page-title {
-    font-size: clamp(1.7rem, 1.2rem + 2vw, 2.3rem);
-}
-
-.hero {
-    padding-block: clamp(1.25rem, 0.8rem + 2vw, 2rem);
-}
-
-.section {
-    padding-block: clamp(0.75rem, 0.5rem + 1.5vw, 1.5rem);
-}
-
-/* Layout gaps slightly tighter */
-.grid,
-.stack {
-    gap: var(--space-2);
-}
-
-/* Container narrower for cleaner look on wide screens */
-.container {
-    max-width: min(1100px, 92vw);
-    padding-inline: var(--space-3);
-}
-
-/* Navigation breadcrumb */
-.nav-breadcrumb {
-    background: rgba(139, 30, 30, 0.05);
-    padding: 1rem 1.5rem;
-    border-radius: 12px;
-    margin-bottom: 2rem;
-    display: flex;
-    align-items: center;
-    gap: 0.5rem;
-    font-size: 0.95rem;
-    color: var(--text-secondary);
-    animation: fadeIn 0.5s ease-out;
-}
-
-.nav-breadcrumb a {
-    color: var(--musigma-red);
-    text-decoration: none;
-    font-weight: 600;
-    transition: color 0.3s ease;
-}
-
-.nav-breadcrumb a:hover {
-    color: var(--accent-orange);
-}
-</style>
-""", unsafe_allow_html=True)
-st.markdown("""
-<style>
-/* Smaller, tighter titles/headings + box sizing */
-:root {
-    --heading-weight: 650;
-    --title-padding-y: 0.5rem;
-    --title-padding-x: 0.75rem;
-    --title-radius: 8px;
-    --space-1: 0.25rem;
-    --space-2: 0.5rem;
-    --space-3: 0.75rem;
-}
-
-/* Compact Section Heading Boxes */
-.section-title-box {
-    background: linear-gradient(135deg, var(--musigma-red) 0%, var(--accent-orange) 100%) !important;
-    border-radius: 12px !important;
-    padding: 0.9rem 1.2rem !important;
-    margin: 0.5rem 0 0.5rem 0 !important; /* Reduced margins from 1.5rem to 0.5rem */
-    box-shadow: var(--shadow-md) !important;
-    text-align: center !important;
-    display: flex;
-    align-items: center;
-    justify-content: center;
-    position: relative;
-    overflow: hidden;
-    transition: all 0.3s ease-in-out;
-}
-
-.section-title-box h2,
-.section-title-box h3,
-.section-title-box h4 {
-    color: var(--text-light) !important;
-    margin: 0 !important;
-    font-weight: 800 !important;
-    font-size: 1.25rem !important;
-    font-family: 'Poppins', sans-serif !important;
-    letter-spacing: 0.3px;
-    text-align: center !important;
-    display: flex;
-    align-items: center;
-    justify-content: center;
-    gap: 0.5rem;
-}
-
-.section-title-box:hover {
-    box-shadow: 0 0 18px rgba(255, 107, 53, 0.3) !important;
-    transform: translateY(-2px);
-}
-  /* Compact Main Page Title (Hero Box) */
-.page-title {
-    background: linear-gradient(135deg, var(--musigma-red) 0%, var(--accent-orange) 100%);
-    background-size: 200% 200%;
-    animation: gradientFlow 6s ease infinite;
-    padding: 1.4rem 1.8rem !important;   /* ↓ Reduced height */
-    border-radius: 18px !important;
-    text-align: center;
-    margin-bottom: 2rem !important;       /* ↓ Less vertical gap */
-    box-shadow: var(--shadow-lg);
-    border: 2px solid rgba(255, 255, 255, 0.15);
-    position: relative;
-    overflow: hidden;
-}
-
-/* Title text inside hero */
-.page-title h1 {
-    margin: 0;
-    font-weight: 800;
-    color: #ffffff !important;
-    font-size: 2.2rem !important;        /* ↓ Reduced font size */
-    letter-spacing: -0.5px;
-    text-shadow: 2px 2px 4px rgba(0,0,0,0.25);
-    font-family: 'Poppins', sans-serif;
-}
-
-.page-subtitle {
-    color: rgba(255,255,255,0.9) !important;
-    font-size: 1rem !important;          /* ↓ Slightly smaller subtitle */
-    margin-top: 0.3rem;
-    font-weight: 400;
-    letter-spacing: 0.3px;
-}
-
-/* Optional subtle hover lift for the main title box */
-.page-title:hover {
-    transform: translateY(-3px);
-    box-shadow: 0 0 22px rgba(255, 107, 53, 0.4);
-}
-            
-</style>
-""", unsafe_allow_html=True)
 # ========================
 # 🔗 CLICKABLE MU SIGMA LOGO TO TOGGLE ADMIN PANEL
 # ========================
@@ -1315,42 +154,43 @@ st.markdown(("""
 # 🧠 JavaScript toggle bridge (connects sessionStorage to Streamlit)
 # ========================
 # Try to use streamlit_javascript if available; otherwise fall back to a tiny component
-try:
-    if st_javascript is not None:
-        toggle_signal = st_javascript("""
-            let toggled = window.sessionStorage.getItem('adminPanelToggled');
-            if (toggled === 'true') {
-                return 'show';
-            } else {
-                return 'hide';
-            }
-        """)
-    else:
-        raise ImportError("st_javascript not available")
-except Exception:
-    # Fallback: use st.components.v1 to run a small JS snippet that returns the value
-    import streamlit.components.v1 as components
+with perf_tracer.span("admin_toggle_js"):
     try:
-        toggle_signal = components.html(
-            """
-            <script>
-            (function() {
-                const t = window.sessionStorage.getItem('adminPanelToggled');
-                const out = (t === 'true') ? 'show' : 'hide';
-                const el = document.createElement('div');
-                el.id = 'admin-toggle-signal';
-                el.textContent = out;
-                document.body.appendChild(el);
-            })();
-            </script>
-            <div id="admin-toggle-signal"></div>
-            """,
-            height=0
-        )
-        # components.html doesn't return the value to Python; we'll instead try reading via query params fallback
-        toggle_signal = None
+        if st_javascript is not None:
+            toggle_signal = st_javascript("""
+                let toggled = window.sessionStorage.getItem('adminPanelToggled');
+                if (toggled === 'true') {
+                    return 'show';
+                } else {
+                    return 'hide';
+                }
+            """)
+        else:
+            raise ImportError("st_javascript not available")
     except Exception:
-        toggle_signal = None
+        # Fallback: use st.components.v1 to run a small JS snippet that returns the value
+        import streamlit.components.v1 as components
+        try:
+            toggle_signal = components.html(
+                """
+                <script>
+                (function() {
+                    const t = window.sessionStorage.getItem('adminPanelToggled');
+                    const out = (t === 'true') ? 'show' : 'hide';
+                    const el = document.createElement('div');
+                    el.id = 'admin-toggle-signal';
+                    el.textContent = out;
+                    document.body.appendChild(el);
+                })();
+                </script>
+                <div id="admin-toggle-signal"></div>
+                """,
+                height=0
+            )
+            # components.html doesn't return the value to Python; we'll instead try reading via query params fallback
+            toggle_signal = None
+        except Exception:
+            toggle_signal = None
 
 # Ensure admin panel state exists
 if 'show_admin_panel' not in st.session_state:
@@ -1453,190 +293,201 @@ if st.session_state.show_admin_panel and not st.session_state.admin_view_selecte
 # -----------------------------
 # Config - Data & Auth
 # -----------------------------
-TENANT_ID = "talos"
-AUTH_TOKEN = None
-HEADERS_BASE = {"Content-Type": "application/json"}
+# Tenant, headers, Talos URL, the account/industry mapping and API_CONFIGS
+# live in vocab_config.py (shared with the batch CLI, batch_extract.py)
 
 # ================================
 # 🏢 Account & Industry Mapping (Expanded + Stable Auto-Mapping)
 # ================================
 
+# --- Registry: built once per process, rebuilt only when accounts.json changes ---
+@st.cache_resource(max_entries=2)
+def load_registry_version(path, mtime_ns):
+    if (path, mtime_ns) == (ACCOUNT_REGISTRY.source, ACCOUNT_REGISTRY.mtime_ns):
+        registry = ACCOUNT_REGISTRY  # same file vocab_config parsed at import: don't parse it twice
+    else:
+        registry = load_account_registry(path)
+    stats = registry.stats()
+    logger.info("Account registry loaded from %s: %d accounts, %d industries, %d aliases",
+                path, stats["accounts"], stats["industries"], stats["aliases"])
+    return registry
+
+
+def get_account_registry():
+    """Current AccountRegistry (one os.stat per rerun to notice edits to accounts.json)"""
+    try:
+        return load_registry_version(ACCOUNTS_FILE, os.stat(ACCOUNTS_FILE).st_mtime_ns)
+    except (OSError, ValueError) as e:
+        # Missing or half-written file: keep the registry loaded at import time
+        logger.warning("Could not reload %s (%s); using the registry loaded at startup", ACCOUNTS_FILE, e)
+        return ACCOUNT_REGISTRY
+
+
+account_registry = get_account_registry()
+ACCOUNT_INDUSTRY_MAP = account_registry.industry_map
+ACCOUNTS = account_registry.accounts
+INDUSTRIES = account_registry.industries
+
 # --- Safe defaults ---
 if "account" not in st.session_state:
     st.session_state.account = "Select Account"
 if "industry" not in st.session_state:
     st.session_state.industry = "Select Industry"
 
-# -----------------------------
-# EXPANDED ACCOUNTS with Industry Mapping (CORRECTED VERSION)
-# -----------------------------
-ACCOUNT_INDUSTRY_MAP = {
-    "Select Account": "Select Industry",
-
-    # --- Priority Accounts (shown first) ---
-    "Abbvie": "Pharma", "BMS": "Pharma", "BLR Airport": "Other",
-    "Chevron": "Energy", "Coles": "Retail", "DELL": "Technology",
-    "Microsoft": "Technology", "Mu Labs": "Technology", "Nike": "Consumer Goods",
-    "Skill Development": "Education", "Southwest Airlines": "Airlines",
-    "Sabic": "Energy", "Johnson & Johnson": "Pharma", "THD": "Retail",
-    "Tmobile": "Telecom", "Walmart": "Retail",
-
-    # --- Rest of the Accounts ---
-    # Pharmaceutical
-    "Pfizer": "Pharma", "Novartis": "Pharma", "Merck": "Pharma", "Roche": "Pharma",
-
-    # Technology
-    "IBM": "Technology", "Oracle": "Technology", "SAP": "Technology",
-    "Salesforce": "Technology", "Adobe": "Technology",
-
-    # Retail
-    "Target": "Retail", "Costco": "Retail", "Kroger": "Retail", "Tesco": "Retail",
-    "Carrefour": "Retail",
-
-    # Airlines
-    "Delta Airlines": "Airlines", "United Airlines": "Airlines", "American Airlines": "Airlines",
-    "Emirates": "Airlines", "Lufthansa": "Airlines",
-
-    # Consumer Goods
-    "Adidas": "Consumer Goods", "Unilever": "Consumer Goods",
-    "Procter & Gamble": "Consumer Goods", "Coca-Cola": "Consumer Goods",
-    "PepsiCo": "Consumer Goods", "Mars": "Consumer Goods",
-
-    # Energy
-    "ExxonMobil": "Energy", "Shell": "Energy", "BP": "Energy", "TotalEnergies": "Energy",
-
-    # Finance
-    "JPMorgan Chase": "Finance", "Bank of America": "Finance", "Wells Fargo": "Finance",
-    "Goldman Sachs": "Finance", "Morgan Stanley": "Finance", "Citigroup": "Finance",
-
-    # Healthcare
-    "UnitedHealth": "Healthcare", "CVS Health": "Healthcare", "Anthem": "Healthcare",
-    "Humana": "Healthcare", "Kaiser Permanente": "Healthcare",
-
-    # Logistics
-    "FedEx": "Logistics", "UPS": "Logistics", "DHL": "Logistics",
-    "Maersk": "Logistics", "Amazon Logistics": "Logistics",
-
-    # E-commerce
-    "Amazon": "E-commerce", "Alibaba": "E-commerce", "eBay": "E-commerce",
-    "Shopify": "E-commerce", "Flipkart": "E-commerce",
-
-    # Automotive
-    "Tesla": "Automotive", "Ford": "Automotive", "General Motors": "Automotive",
-    "Toyota": "Automotive", "Volkswagen": "Automotive",
-
-    # Hospitality
-    "Marriott": "Hospitality", "Hilton": "Hospitality",
-    "Hyatt": "Hospitality", "Airbnb": "Hospitality",
-
-    # Education
-    "Coursera": "Education", "Udemy": "Education", "Khan Academy": "Education"
-}
-
-# --- Priority Accounts ---
-PRIORITY_ACCOUNTS = [
-    "Abbvie", "BMS", "BLR Airport", "Chevron", "Coles", "DELL",
-    "Microsoft", "Mars", "Mu Labs", "Nike", "Skill Development",
-    "Southwest Airlines", "Sabic", "Johnson & Johnson", "THD",
-    "Tmobile", "Walmart"
-]
-
-# --- Add remaining accounts (alphabetically) ---
-OTHER_ACCOUNTS = [
-    acc for acc in ACCOUNT_INDUSTRY_MAP.keys()
-    if acc not in PRIORITY_ACCOUNTS and acc != "Select Account"
-]
-OTHER_ACCOUNTS.sort()
-OTHER_ACCOUNTS.append("Others")
-
-# --- Add 'Others' mapping ---
-ACCOUNT_INDUSTRY_MAP["Others"] = "Other"
-
-# --- Final ordered account list ---
-ACCOUNTS = ["Select Account"] + PRIORITY_ACCOUNTS + OTHER_ACCOUNTS
-
-# --- Unique Industries ---
-all_industries = list(set(ACCOUNT_INDUSTRY_MAP.values()))
-INDUSTRIES = sorted([i for i in all_industries if i != "Select Industry"])
-if "Other" not in INDUSTRIES:
-    INDUSTRIES.append("Other")
-INDUSTRIES = ["Select Industry"] + INDUSTRIES
-
-# --- Debug Info ---
-print(f"Total Accounts: {len(ACCOUNTS)}")
-print(f"Total Industries: {len(INDUSTRIES)}")
-print(f"Industries: {INDUSTRIES}")
-
-# === API CONFIGURATION ===
-API_CONFIGS = [
-    {
-        "name": "vocabulary",
-        "url": "https://eoc.mu-sigma.com/talos-engine/agency/reasoning_api?society_id=1757657318406&agency_id=1758548233201&level=1",
-        "multiround_convo":3,
-        "description": "vocabulary",
-        "prompt": lambda problem, outputs: (
-            f"{problem}\n\nExtract the vocabulary from this problem statement."
-        )
-    }
-]
+def apply_account_search():
+    """on_change of the account search box: select the best fuzzy/alias match"""
+    query = st.session_state.get("account_search", "").strip()
+    if not query:
+        st.session_state.account_search_note = ""
+        return
+    registry = get_account_registry()
+    matches = registry.search(query, limit=3)
+    if not matches:
+        st.session_state.account_search_note = f"⚠️ No account matches \"{query}\"."
+        return
+    account = matches[0][0]
+    st.session_state.account = account
+    st.session_state.account_selector_main = account  # the dropdown keeps its own widget state
+    st.session_state.industry = registry.industry_map.get(account, "Other")
+    st.session_state.industry_updated = True
+    note = f"✅ Selected **{account}**"
+    if len(matches) > 1:
+        note += " · also close: " + ", ".join(name for name, _ in matches[1:])
+    st.session_state.account_search_note = note
+
+# === RESULT CACHE ===
+# One SQLite-backed cache per process, shared by every session.
+@st.cache_resource
+def get_result_cache():
+    return open_result_cache(BASE_DIR)
+
+# === RESULT BACKUPS ===
+# Finished analyses keyed by job/session id, written behind by a background thread
+# (replaces the single shared streamlit_vocab_backup.txt in the temp dir).
+@st.cache_resource
+def get_result_store():
+    return open_result_store(BASE_DIR)
+
+# === FEEDBACK INDEX ===
+# Indexed SQLite mirror of feedback.csv for the admin report; synced
+# incrementally (only appended rows are parsed, nothing when the file is unchanged).
+@st.cache_resource
+def get_feedback_index():
+    return open_feedback_index(feedback_store, BASE_DIR)
+
+# === TALOS CLIENT ===
+# Process-wide so the keep-alive connection pool and circuit breaker state
+# are shared by all sessions (no per-analysis DNS/TCP/TLS handshake).
+@st.cache_resource
+def get_talos_client():
+    return TalosClient(session=PooledTransport())
+
+# === TALOS SCHEDULER ===
+# Process-wide queue in front of the client: per tenant/agency rate limit and
+# single-flight for identical requests (see talos_scheduler.py).
+@st.cache_resource
+def get_request_scheduler():
+    return RequestScheduler()
+
+# Sessions analysing the same problem/account at the same time share one extraction
+@st.cache_resource
+def get_extraction_singleflight():
+    return SingleFlight()
+
+# === EXTRACTION JOBS ===
+# Analyses run on a process-wide worker pool; sessions only hold the job id, so a
+# page reload or websocket reconnect picks the running job up again.
+@st.cache_resource
+def get_extraction_jobs():
+    return ExtractionJobs()
+
+# How often the job panel polls a running extraction (seconds)
+JOB_POLL_SECONDS = float(os.environ.get("EXTRACTION_JOB_POLL_SECONDS", 1.0))
+
 # -----------------------------
 # Utility Functions
 # -----------------------------
-def json_to_text(data):
-    if data is None: 
-        return ""
-    if isinstance(data, str): 
-        return data
-    if isinstance(data, dict):
-        for key in ("result", "output", "content", "text"):
-            if key in data and data[key]: 
-                return json_to_text(data[key])
-        if "data" in data: 
-            return json_to_text(data["data"])
-        return "\n".join(f"{k}: {json_to_text(v)}" for k, v in data.items() if v)
-    if isinstance(data, list): 
-        return "\n".join(json_to_text(x) for x in data if x)
-    return str(data)
-
-def sanitize_text(text):
-    """Remove markdown artifacts and clean up text"""
-    if not text:
-        return ""
-    
-    # Fix the "s" character issue - remove stray 's' characters at the beginning
-    text = re.sub(r'^\s*s\s+', '', text.strip())
-    text = re.sub(r'\n\s*s\s+', '\n', text)
-    
-    text = re.sub(r'Q\d+\s*Answer\s*Explanation\s*:', '', text, flags=re.IGNORECASE)
-    text = re.sub(r'\*\*(.*?)\*\*', r'\1', text)
-    text = re.sub(r'\*(.*?)\*', r'\1', text)
-    text = re.sub(r'`(.*?)`', r'\1', text)
-    text = re.sub(r'#+\s*', '', text)
-    text = re.sub(r'!\[.*?\]\(.*?\)', '', text)
-    text = re.sub(r'\[(.*?)\]\(.*?\)', r'\1', text)
-    text = re.sub(r'\n{3,}', '\n\n', text)
-    text = re.sub(r' {2,}', ' ', text)
-    text = re.sub(r'^\s*[-*]\s+', '• ', text, flags=re.MULTILINE)
-    text = re.sub(r'<\/?[^>]+>', '', text)
-    text = re.sub(r'&', '&', text)
-    text = re.sub(r'& Key Takeaway:', 'Key Takeaway:', text)
-    
-    return text.strip()
+# Precompiled line rules for format_vocabulary_paragraphs
+_BULLET_MARK = re.compile(r'(?m)^\s*[-*]\s+')
+_STEP_HEADING = re.compile(r'(Step\s*\d+\s*:)', re.IGNORECASE)
+_NUMBERED_COLON = re.compile(r'^\s*(\d+\.\s+[^:]+):\s*(.*)$')
+_NUMBERED_BLOCK = re.compile(r'^\s*(\d+\.\s+.+)$')
+_BULLET_HEADING = re.compile(r'^\s*(?:•|\d+\.)\s*([^:]+):\s*(.*)$')
+_SIDE_HEADING = re.compile(r'^\s*([^:]+):\s*(.*)$')
+_REVENUE_GROWTH_RATE = re.compile(r'\s*Revenue\s+Growth\s+Rate\s*', re.IGNORECASE)
+_REGEX_META = r".^$*+?{}[]\|()"
+
+
+def _literal_trie_pattern(phrases):
+    """Regex for a set of literal phrases, shaped as a trie.
+
+    At each position the engine follows one branch per character instead of
+    trying every phrase, and the greedy optional groups make the longest
+    phrase win.
+    """
+    trie = {}
+    for phrase in phrases:
+        node = trie
+        for ch in phrase:
+            node = node.setdefault(ch, {})
+        node[""] = {}
 
+    def build(node):
+        branches = [re.escape(ch) + build(child) for ch, child in node.items() if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if "" in node else body
 
-def format_vocabulary_with_bold(text, extra_phrases=None):
+    return build(trie)
+
+
+def _compile_extra_phrases(extra_phrases):
+    """Combine all extra_phrases into one case-insensitive pattern (None if none).
+
+    Phrases containing regex metacharacters are used as regexes (escaped if
+    they do not compile); plain phrases go into a literal trie.
+    """
+    literals, regexes = [], []
+    for p in extra_phrases or ():
+        if not p:
+            continue
+        if any(ch in p for ch in _REGEX_META):
+            try:
+                re.compile(p)
+                regexes.append(f"(?:{p})")
+            except re.error:
+                literals.append(p)
+        else:
+            literals.append(p)
+    alternatives = ([_literal_trie_pattern(literals)] if literals else []) + regexes
+    if not alternatives:
+        return None
+    try:
+        return re.compile("|".join(alternatives), re.IGNORECASE)
+    except re.error:
+        # e.g. duplicate group names across phrases: treat everything literally
+        return re.compile(_literal_trie_pattern(literals + [r[3:-1] for r in regexes]), re.IGNORECASE)
+
+
+def _bold_match(m):
+    return f"<strong>{m.group(0)}</strong>"
+
+
+def format_vocabulary_paragraphs(text, extra_phrases=None):
     """
+    Build the inner <p> HTML of the vocabulary box (see format_vocabulary_with_bold).
     Updated formatter rules (high-level):
       - Replace ' - ' with ' :'
       - Normalize bullets(-, *) -> •
       - If a numbered heading has a colon (e.g. '10. Heading:'), bold ONLY the numbered heading (left-of-colon).
       - If a numbered heading has NO colon (e.g. '2. Heading'), bold the whole numbered heading line and its immediate continuation lines.
       - 'Step N:' bolds the whole block (line + continuation lines).
-      - extra_phrases: optional list of strings/regex to bold wherever they appear.
+      - extra_phrases: optional list of strings/regex to bold wherever they appear
+        (matched in a single pass; where phrases overlap the longest/first one wins).
+    Each line is classified once, by its first non-space character, so only the
+    rules that can apply to it are tried.
     """
-    if not text:
-        return "No vocabulary data available"
-
     # If you have sanitize_text, keep it; otherwise fall back to identity.
     try:
         clean_text = sanitize_text(text)
@@ -1645,16 +496,10 @@ def format_vocabulary_with_bold(text, extra_phrases=None):
 
     # basic normalization
     clean_text = clean_text.replace(" - ", " : ")
-    clean_text = re.sub(r'(?m)^\s*[-*]\s+', '• ', clean_text)
+    clean_text = _BULLET_MARK.sub('• ', clean_text)
 
-    # prepare extra phrase patterns
-    extra_patterns = []
-    if extra_phrases:
-        for p in extra_phrases:
-            if any(ch in p for ch in r".^$*+?{}[]\|()"):
-                extra_patterns.append(p)
-            else:
-                extra_patterns.append(re.escape(p))
+    # one combined pattern for all extra phrases
+    extra_pattern = _compile_extra_phrases(extra_phrases)
 
     lines = clean_text.splitlines()
     n = len(lines)
@@ -1669,12 +514,11 @@ def format_vocabulary_with_bold(text, extra_phrases=None):
             next_line = lines[j]
             if not next_line.strip():  # paragraph boundary
                 break
-            if re.match(r'^\s+', next_line) or re.match(r'^\s*[a-z]', next_line):
+            first = next_line.lstrip()[:1]
+            if next_line[:1].isspace() or 'a' <= first <= 'z':
                 block_lines.append(next_line.rstrip())
                 j += 1
                 continue
-            if re.match(r'^\s*(?:•|-|\d+\.)\s+', next_line):
-                break
             break
         return block_lines, j
 
@@ -1686,70 +530,72 @@ def format_vocabulary_with_bold(text, extra_phrases=None):
             continue
 
         # 1) extra phrases (inline replacements)
-        if extra_patterns:
-            new_ln = ln
-            for pat in extra_patterns:
-                try:
-                    new_ln = re.sub(pat, lambda m: f"<strong>{m.group(0)}</strong>", new_ln, flags=re.IGNORECASE)
-                except re.error:
-                    new_ln = re.sub(re.escape(pat), lambda m: f"<strong>{m.group(0)}</strong>", new_ln, flags=re.IGNORECASE)
+        if extra_pattern is not None:
+            new_ln = extra_pattern.sub(_bold_match, ln)
             if new_ln != ln:
                 paragraph_html.append(new_ln)
                 i += 1
                 continue
 
         # 2) Step N: anywhere -> bold entire block (line + continuation)
-        if re.search(r'(Step\s*\d+\s*:)', ln, flags=re.IGNORECASE):
+        if _STEP_HEADING.search(ln):
             block, j = collect_continuation(i)
             block_text = "<br>".join([b.strip() for b in block])
             paragraph_html.append(f"<strong>{block_text}</strong>")
             i = j
             continue
 
-        # 3) Numbered heading WITH colon: bold only left-of-colon (the numbered heading)
-        m_num_colon = re.match(r'^\s*(\d+\.\s+[^:]+):\s*(.*)$', ln)
-        if m_num_colon:
-            heading = m_num_colon.group(1).strip()
-            remainder = m_num_colon.group(2).strip()
-            if remainder:
-                paragraph_html.append(f"<strong>{heading}:</strong> {remainder}")
-            else:
-                paragraph_html.append(f"<strong>{heading}:</strong>")
-            i += 1
-            continue
+        first = ln.lstrip()[:1]
+        numbered = first.isdecimal()
+
+        if numbered:
+            # 3) Numbered heading WITH colon: bold only left-of-colon (the numbered heading)
+            m_num_colon = _NUMBERED_COLON.match(ln)
+            if m_num_colon:
+                heading = m_num_colon.group(1).strip()
+                remainder = m_num_colon.group(2).strip()
+                if remainder:
+                    paragraph_html.append(f"<strong>{heading}:</strong> {remainder}")
+                else:
+                    paragraph_html.append(f"<strong>{heading}:</strong>")
+                i += 1
+                continue
 
-        # 4) Numbered heading WITHOUT colon: bold whole block (line + continuation) — previous behavior
-        m_num_no_colon = re.match(r'^\s*(\d+\.\s+.+)$', ln)
-        if m_num_no_colon:
-            block, j = collect_continuation(i)
-            block_text = "<br>".join([b.strip() for b in block])
-            paragraph_html.append(f"<strong>{block_text}</strong>")
-            i = j
-            continue
+            # 4) Numbered heading WITHOUT colon: bold whole block (line + continuation) — previous behavior
+            if _NUMBERED_BLOCK.match(ln):
+                block, j = collect_continuation(i)
+                block_text = "<br>".join([b.strip() for b in block])
+                paragraph_html.append(f"<strong>{block_text}</strong>")
+                i = j
+                continue
+
+        has_colon = ':' in ln
 
         # 5) Bullet/heading with colon (non-numbered): bold left-of-colon
-        m_bullet_heading = re.match(r'^\s*(?:•|\d+\.)\s*([^:]+):\s*(.*)$', ln)
-        if m_bullet_heading:
-            heading = m_bullet_heading.group(1).strip()
-            remainder = m_bullet_heading.group(2).strip()
-            if remainder:
-                paragraph_html.append(f"• <strong>{heading}:</strong> {remainder}")
-            else:
-                paragraph_html.append(f"• <strong>{heading}:</strong>")
-            i += 1
-            continue
+        if has_colon and (numbered or first == '•'):
+            m_bullet_heading = _BULLET_HEADING.match(ln)
+            if m_bullet_heading:
+                heading = m_bullet_heading.group(1).strip()
+                remainder = m_bullet_heading.group(2).strip()
+                if remainder:
+                    paragraph_html.append(f"• <strong>{heading}:</strong> {remainder}")
+                else:
+                    paragraph_html.append(f"• <strong>{heading}:</strong>")
+                i += 1
+                continue
 
         # 6) Generic inline heading "LeftOfColon: rest" -> bold left-of-colon if short
-        m_side = re.match(r'^\s*([^:]+):\s*(.*)$', ln)
-        if m_side and len(m_side.group(1).split()) <= 8:
-            left = m_side.group(1).strip()
-            right = m_side.group(2).strip()
-            paragraph_html.append(f"<strong>{left}:</strong> {right}" if right else f"<strong>{left}:</strong>")
-            i += 1
-            continue
+        if has_colon:
+            m_side = _SIDE_HEADING.match(ln)
+            if m_side and len(m_side.group(1).split()) <= 8:
+                left = m_side.group(1).strip()
+                right = m_side.group(2).strip()
+                paragraph_html.append(f"<strong>{left}:</strong> {right}" if right else f"<strong>{left}:</strong>")
+                i += 1
+                continue
 
         # 7) Full-line special-case "Revenue Growth Rate"
-        if re.fullmatch(r'\s*Revenue\s+Growth\s+Rate\s*', ln, flags=re.IGNORECASE):
+        if first in ('R', 'r') and _REVENUE_GROWTH_RATE.fullmatch(ln):
             paragraph_html.append(f"<strong>{ln.strip()}</strong>")
             i += 1
             continue
@@ -1772,8 +618,11 @@ def format_vocabulary_with_bold(text, extra_phrases=None):
         final_paragraphs.append("<br>".join(temp_lines))
 
     para_wrapped = [f"<p style='margin:6px 0; line-height:1.45; font-size:0.98rem;'>{p}</p>" for p in final_paragraphs]
-    final_html = "\n".join(para_wrapped)
+    return "\n".join(para_wrapped)
 
+
+def wrap_vocabulary_html(final_html):
+    """Wrap formatted paragraphs in the scrollable vocabulary box"""
     formatted_output = f"""
     <div style="
         background: var(--bg-card);
@@ -1794,15 +643,214 @@ def format_vocabulary_with_bold(text, extra_phrases=None):
     formatted_output = re.sub(r'(<br>\s*){3,}', '<br><br>', formatted_output)
     return formatted_output
 
+
+def format_vocabulary_with_bold(text, extra_phrases=None):
+    """Render vocabulary text as the bolded HTML box shown on the page"""
+    if not text:
+        return "No vocabulary data available"
+    return wrap_vocabulary_html(format_vocabulary_paragraphs(text, extra_phrases))
+
+# === RENDER CACHE ===
+# Theme toggles, radio clicks and feedback keystrokes all rerun the script;
+# the formatted vocabulary HTML only depends on these inputs, so keep it.
+@st.cache_resource
+def get_render_cache():
+    return LRUCache(maxsize=256)
+
+
+# Download bodies by (vocabulary digest, format); built on click only, the dated header is added per click
+@st.cache_resource
+def get_vocab_export_cache():
+    return LRUCache(maxsize=64)
+
+
+def render_vocabulary_html(vocab_text, account_name="", industry_name="", extra_phrases=None, theme="light",
+                           digest=None):
+    """Formatted vocabulary HTML with 'the company'/'the industry' substituted, memoized (LRU).
+
+    Pass digest (VocabularyDoc.digest) to skip re-hashing the text on every rerun.
+    """
+    key = (
+        digest or hashlib.sha256((vocab_text or "").encode("utf-8")).hexdigest(),
+        account_name,
+        industry_name,
+        tuple(extra_phrases or ()),
+        theme,
+    )
+
+    def render():
+        formatted_vocab = format_vocabulary_with_bold(vocab_text, extra_phrases)
+        # Replace generic mentions in the ALREADY FORMATTED HTML
+        if account_name:
+            # Use a more careful replacement that preserves HTML tags
+            formatted_vocab = re.sub(r'\bthe company\b', account_name, formatted_vocab, flags=re.IGNORECASE)
+        if industry_name:
+            formatted_vocab = re.sub(r'\bthe industry\b', industry_name, formatted_vocab, flags=re.IGNORECASE)
+        return formatted_vocab
+
+    return get_render_cache().get_or_compute(key, render)
+
+
+def get_vocabulary_doc():
+    """Parsed VocabularyDoc of the current vocabulary (re-parsed only if the text changed)"""
+    vocab_text = st.session_state.outputs.get("vocabulary", "")
+    doc = st.session_state.get("vocab_doc")
+    if doc is None or doc.text != vocab_text:
+        doc = VocabularyDoc.from_text(vocab_text)
+        st.session_state.vocab_doc = doc
+    return doc
+
+
+def start_extraction_job(problem_text, account, industry):
+    """Submit the agency pipeline for this problem to the background job pool"""
+    full_context = build_full_context(problem_text, account, industry)
+    headers = build_headers()
+    talos_client = get_talos_client()
+    request_scheduler = get_request_scheduler()
+    extraction_singleflight = get_extraction_singleflight()
+    result_cache = get_result_cache()
+    result_store = get_result_store()
+    session_id = st.session_state.session_id
+    tracer = perf_tracer
+
+    def run(job):
+        # Runs on a job worker thread: no st.* calls in here, progress goes through job.update()
+        # Streaming preview state: paragraphs are formatted once, as they complete
+        stream_state = {"round": None, "accumulator": None, "html": []}
+
+        def run_agency(api_cfg, dep_outputs, emit):
+            cache_key = agency_cache_key(api_cfg, problem_text, account, industry, dep_outputs)
+            return extract_agency(
+                api_cfg, full_context, dep_outputs, cache_key, talos_client, result_cache, headers,
+                on_round=lambda round_no, rounds, text: emit("round", (round_no, rounds, text)),
+                on_chunk=lambda round_no, piece: emit("chunk", (round_no, piece)),
+                tracer=tracer,
+                scheduler=request_scheduler,
+                on_queue=lambda position: emit("queue", position),
+                singleflight=extraction_singleflight,
+                on_join=lambda: emit("joined"),
+            )
+
+        def on_agency_event(name, kind, payload):
+            if kind == "joined":
+                job.update(note=f"🤝 The same {name} analysis is already running for another user; sharing its result...")
+                return
+            if kind == "queue":
+                # Shared rate limit: show where this request is in the Talos queue
+                job.update(note=f"⏳ Talos is busy: {name} request is #{payload} in the queue..." if payload else "")
+                return
+            if name != "vocabulary":
+                return
+            if kind == "chunk":
+                # Format each completed paragraph as soon as it arrives
+                round_no, piece = payload
+                if piece is None:
+                    # Stream ended: the last paragraph has no break after it
+                    if stream_state["round"] != round_no:
+                        return  # nothing was streamed (e.g. a cache hit)
+                    new_paragraphs = stream_state["accumulator"].flush()
+                else:
+                    if stream_state["round"] != round_no:
+                        stream_state.update(round=round_no, accumulator=ParagraphAccumulator(), html=[])
+                    new_paragraphs = stream_state["accumulator"].feed(piece)
+                if new_paragraphs:
+                    stream_state["html"].extend(format_vocabulary_paragraphs(p) for p in new_paragraphs)
+                    job.update(preview_caption="", preview_html=wrap_vocabulary_html("\n".join(stream_state["html"])))
+            elif kind == "round":
+                # Intermediate multi-round results while later rounds run
+                round_no, rounds, text = payload
+                stream_state["round"] = None
+                job.update(preview_caption=f"Round {round_no} of up to {rounds} — refining...",
+                           preview_html=format_vocabulary_with_bold(text))
+
+        def on_agency_complete(name, result, done, total):
+            job.update(done=done, total=total)
+
+        # All configured agencies run concurrently (dependencies permitting)
+        with tracer.span("analysis_total"):
+            results = run_agencies(API_CONFIGS, run_agency, on_complete=on_agency_complete, on_event=on_agency_event)
+        # Backup for admin access, keyed by this job (queued, not written on this thread)
+        vocabulary = results.get("vocabulary", ("", None))[0]
+        result_store.save(job.job_id, session_id, account, industry, problem_text, vocabulary)
+        return results
+
+    meta = {"problem_text": problem_text, "account": account, "industry": industry}
+    return get_extraction_jobs().submit(run, meta=meta)
+
+
+def apply_extraction_job(job):
+    """Copy a finished job's results into the session (same state the inline analysis used to set)"""
+    st.session_state.extraction_job_id = None
+    if job.status == JOB_FAILED:
+        st.session_state.job_error = job.error
+        try:
+            del st.query_params["job"]
+        except KeyError:
+            pass
+        return
+    st.session_state.outputs = {}
+    st.session_state.stale_agencies = []
+    for name, (text, source) in job.results.items():
+        st.session_state.outputs[name] = text
+        if source == SOURCE_STALE:
+            st.session_state.stale_agencies.append(name)
+
+    # Parse the vocabulary once; rendering, the feedback form and the download use the parsed doc
+    st.session_state.vocab_doc = VocabularyDoc.from_text(st.session_state.outputs.get("vocabulary", ""))
+    st.session_state.analysis_complete = True
+    st.session_state.show_vocabulary = True
+
+
+def render_extraction_job(job):
+    """Progress, queue note and streaming preview of a running job; applies it once finished"""
+    if job is None:
+        # Expired or lost (e.g. the server restarted): let the user start over
+        st.session_state.extraction_job_id = None
+        st.session_state.job_error = "The extraction could not be found anymore. Please run it again."
+        st.rerun()
+    if job.is_finished:
+        apply_extraction_job(job)
+        st.rerun()
+    snap = job.snapshot()
+    st.info("🔍 Extracting vocabulary and analyzing context...")
+    st.progress(snap["done"] / snap["total"] if snap["total"] else 0.0)
+    if snap["note"]:
+        st.caption(snap["note"])
+    if snap["preview_caption"]:
+        st.caption(snap["preview_caption"])
+    if snap["preview_html"]:
+        st.markdown(snap["preview_html"], unsafe_allow_html=True)
+
+
+# st.fragment reruns only the job panel every JOB_POLL_SECONDS; on older Streamlit
+# versions the panel renders once and the whole script reruns after a short
+# sleep at its very end (see the bottom of this file), so the rest of the page
+# still renders and the script thread is never held in a loop.
+_fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None)
+if _fragment is not None:
+    @_fragment(run_every=JOB_POLL_SECONDS)
+    def extraction_job_panel(job_id):
+        render_extraction_job(get_extraction_jobs().get(job_id))
+else:
+    def extraction_job_panel(job_id):
+        render_extraction_job(get_extraction_jobs().get(job_id))
+        st.session_state.job_poll_pending = True
+
+
 def init_session_state():
     defaults = {
         "current_page": "page1",
+        "session_id": uuid.uuid4().hex,  # keys this session's result backups
         "problem_text": "",
         "industry": "Select Industry",
         "account": "Select Account",
         "account_input": "",
         "outputs": {},
         "analysis_complete": False,
+        "vocab_doc": None,  # parsed VocabularyDoc of outputs["vocabulary"]
+        "extraction_job_id": None,  # background analysis being polled (also in ?job=)
+        "stale_agencies": [],  # agencies answered from the stale cache in the last analysis
+        "job_error": None,
         "dimension_scores": {
             "Volatility": 0.0,
             "Ambiguity": 0.0, 
@@ -1835,7 +883,7 @@ def init_session_state():
 def reset_app_state():
     """Completely reset session state to initial values"""
     # Clear all session state
-    keys_to_preserve = ['dark_mode']  # Preserve theme setting
+    keys_to_preserve = ['dark_mode', 'perf_tracer', 'session_id']  # Preserve theme setting, perf traces and backup key
     preserved_state = {key: st.session_state[key] for key in keys_to_preserve if key in st.session_state}
     
     st.session_state.clear()
@@ -1846,6 +894,12 @@ def reset_app_state():
     
     # Re-initialize with defaults
     init_session_state()
+
+    # Forget the finished job so a reload does not bring the old analysis back
+    try:
+        del st.query_params["job"]
+    except KeyError:
+        pass
     
     st.success("✅ Application reset successfully! You can start a new analysis.")
 
@@ -1859,33 +913,19 @@ def submit_feedback(feedback_type, name="", email="", off_definitions="", additi
     # NEW: Get the problem statement
     problem_statement = st.session_state.get("problem_text", "")
     
-    new_entry = pd.DataFrame([[
+    row = [
         timestamp, name, email, additional_feedback, feedback_type, off_definitions, suggestions, account, industry, problem_statement
-    ]], columns=["Timestamp", "Name", "Email", "Feedback", "FeedbackType", "OffDefinitions", "Suggestions", "Account", "Industry", "ProblemStatement"])
+    ]
     
     try:
-        # Try file-based storage first (local development)
-        if os.path.exists(FEEDBACK_FILE):
-            existing = pd.read_csv(FEEDBACK_FILE)
-            
-            # Handle schema mismatch (e.g. if 'ProblemStatement' is missing in existing file)
-            missing_cols = set(new_entry.columns) - set(existing.columns)
-            for col in missing_cols:
-                existing[col] = '' # Add missing columns to existing with default value
-            
-            # Reorder existing columns to match the new entry's order
-            existing = existing[new_entry.columns]
-
-            updated = pd.concat([existing, new_entry], ignore_index=True)
-        else:
-            updated = new_entry
-        
         try:
-            updated.to_csv(FEEDBACK_FILE, index=False)
+            # Locked O(1) append; also migrates an old header missing 'ProblemStatement'
+            feedback_store.append(row)
         except (PermissionError, OSError):
             # Fallback to session state on Streamlit Cloud (read-only filesystem)
+            new_entry = pd.DataFrame([row], columns=FEEDBACK_COLUMNS)
             if 'feedback_data' not in st.session_state:
-                st.session_state.feedback_data = pd.DataFrame(columns=new_entry.columns)
+                st.session_state.feedback_data = pd.DataFrame(columns=FEEDBACK_COLUMNS)
             st.session_state.feedback_data = pd.concat([st.session_state.feedback_data, new_entry], ignore_index=True)
             st.info("📝 Feedback saved to session (cloud mode)")
         
@@ -1895,8 +935,43 @@ def submit_feedback(feedback_type, name="", email="", off_definitions="", additi
         st.error(f"Error saving feedback: {str(e)}")
         return False
 
+
+# Admin feedback table: long texts are cut to this many characters (full text on demand)
+FEEDBACK_PREVIEW_CHARS = {"ProblemStatement": 120}
+FEEDBACK_PAGE_SIZES = [25, 50, 100, 200]
+
+
+def filter_feedback_frame(df, feedback_type=None, account=None, industry=None, date_from=None, date_to=None):
+    """Same filters as FeedbackIndex.query(), for the session-state (cloud mode) DataFrame"""
+    mask = pd.Series(True, index=df.index)
+    for column, value in (("FeedbackType", feedback_type), ("Account", account), ("Industry", industry)):
+        if value:
+            mask &= df[column] == value
+    day = df["Timestamp"].astype(str).str[:10]
+    if date_from:
+        mask &= day >= date_from.strftime("%Y-%m-%d")
+    if date_to:
+        mask &= day <= date_to.strftime("%Y-%m-%d")
+    return df[mask]
+
+
 init_session_state()
 
+# Reattach to a background extraction after a reload or reconnect (?job=<id>)
+job_param = st.query_params.get("job")
+if job_param and not st.session_state.extraction_job_id and not st.session_state.analysis_complete:
+    resumed_job = get_extraction_jobs().get(job_param)
+    if resumed_job is not None:
+        st.session_state.extraction_job_id = resumed_job.job_id
+        st.session_state.problem_text = resumed_job.meta["problem_text"]
+        st.session_state.account = resumed_job.meta["account"]
+        st.session_state.industry = resumed_job.meta["industry"]
+        st.session_state.analysis_account = resumed_job.meta["account"]
+        st.session_state.analysis_industry = resumed_job.meta["industry"]
+        st.session_state.user_info_collected = True
+    else:
+        del st.query_params["job"]
+
 # -----------------------------
 # PAGE 1: Business Problem Input & Analysis (Structural Fix Applied here)
 # -----------------------------
@@ -1930,6 +1005,16 @@ if not st.session_state.get('admin_view_selected', False) or st.session_state.ge
             except (ValueError, AttributeError):
                 current_account_index = 0
 
+            # Typo- and alias-tolerant lookup ("J&J", "T-Mobile", "Walmrt") that drives the dropdown
+            st.text_input(
+                "Find account:",
+                key="account_search",
+                placeholder="Type a name or alias, e.g. J&J",
+                on_change=apply_account_search,
+            )
+            if st.session_state.get("account_search_note"):
+                st.caption(st.session_state.account_search_note)
+
             # Account dropdown - UNIQUE KEY
             selected_account = st.selectbox(
                 "Select Account:",
@@ -2025,7 +1110,7 @@ if not st.session_state.get('admin_view_selected', False) or st.session_state.ge
                 "Extract vocabulary",
                 type="primary",
                 use_container_width=True,
-                disabled=not (
+                disabled=bool(st.session_state.extraction_job_id) or not (
                     st.session_state.problem_text.strip()
                     and st.session_state.account != "Select Account"
                     and st.session_state.industry != "Select Industry"
@@ -2060,58 +1145,22 @@ if not st.session_state.get('admin_view_selected', False) or st.session_state.ge
             st.session_state.analysis_industry = st.session_state.industry
             st.session_state.user_info_collected = True
 
-            full_context = f"""
-            Business Problem:
-            {st.session_state.problem_text.strip()}
-
-            Context:
-            Account: {st.session_state.account}
-            Industry: {st.session_state.industry}
-            """
+            # The analysis runs as a background job: this rerun only submits it and the
+            # job panel below polls for progress (a reload reattaches through ?job=<id>)
+            job = start_extraction_job(
+                st.session_state.problem_text, st.session_state.account, st.session_state.industry
+            )
+            st.session_state.outputs = {}
+            st.session_state.extraction_job_id = job.job_id
+            st.query_params["job"] = job.job_id
+            st.rerun()
 
-            # Prepare headers
-            HEADERS = HEADERS_BASE.copy()
-            HEADERS.update({"Tenant-ID": TENANT_ID, "X-Tenant-ID": TENANT_ID})
-            if AUTH_TOKEN:
-                HEADERS["Authorization"] = f"Bearer {AUTH_TOKEN}"
-
-            with st.spinner("🔍 Extracting vocabulary and analyzing context..."):
-                progress = st.progress(0)
-                st.session_state.outputs = {}
-                session = requests.Session()
-                total = len(API_CONFIGS)
-
-                for i, api_cfg in enumerate(API_CONFIGS):
-                    progress.progress(i / total)
-                    if api_cfg["name"] != "vocabulary":
-                        continue  # run only vocabulary in this mode
-                    try:
-                        goal = api_cfg["prompt"](full_context, {})
-                        resp = session.post(api_cfg["url"], headers=HEADERS, json={"agency_goal": goal})
-                        if resp.status_code == 200:
-                            text = sanitize_text(json_to_text(resp.json()))
-                        else:
-                            text = f"API Error {resp.status_code}"
-                        st.session_state.outputs["vocabulary"] = text
-                    except Exception as e:
-                        st.session_state.outputs["vocabulary"] = f"Error: {str(e)}"
-
-                progress.progress(1.0)
-                session.close()
-                st.session_state.analysis_complete = True
-                st.session_state.show_vocabulary = True
-                
-                # Store vocabulary in a temporary file as backup for admin access
-                try:
-                    import tempfile
-                    vocab_backup_file = os.path.join(tempfile.gettempdir(), "streamlit_vocab_backup.txt")
-                    with open(vocab_backup_file, 'w', encoding='utf-8') as f:
-                        f.write(st.session_state.outputs.get("vocabulary", ""))
-                except Exception:
-                    pass  # Silently fail if file write doesn't work
-                
-                st.success("✅ Vocabulary extraction complete!")
-                st.rerun()
+        # ---- Background extraction in progress ----
+        if st.session_state.job_error:
+            st.error(f"❌ Vocabulary extraction failed: {st.session_state.job_error}")
+            st.session_state.job_error = None
+        if not st.session_state.analysis_complete and st.session_state.extraction_job_id:
+            extraction_job_panel(st.session_state.extraction_job_id)
 
     # ---- Show Vocabulary Directly After Analysis ----
     if st.session_state.analysis_complete:
@@ -2160,30 +1209,24 @@ if not st.session_state.get('admin_view_selected', False) or st.session_state.ge
         except Exception:
             pass
         
-        vocab_text = st.session_state.outputs.get("vocabulary", "")
-        
-        # ✅ Step 1: Get the pre-formatted HTML from your function
-        formatted_vocab = format_vocabulary_with_bold(vocab_text)
+        for name in st.session_state.stale_agencies:
+            st.warning(f"⚠️ The {name} service is unavailable right now; showing a previously cached result.")
+
+        vocab_doc = get_vocabulary_doc()
+        vocab_text = vocab_doc.text
 
-        # ✅ Step 2: Dynamically get account & industry for substitutions
+        # ✅ Step 1: Dynamically get account & industry for substitutions
         account_name = st.session_state.get("analysis_account", "").strip()
         industry_name = st.session_state.get("analysis_industry", "").strip()
 
-        # ✅ Step 3: Replace generic mentions in the ALREADY FORMATTED HTML
-        if account_name:
-            # Use a more careful replacement that preserves HTML tags
-            formatted_vocab = re.sub(
-                r'\bthe company\b', 
-                account_name, 
-                formatted_vocab, 
-                flags=re.IGNORECASE
-            )
-        if industry_name:
-            formatted_vocab = re.sub(
-                r'\bthe industry\b', 
-                industry_name, 
-                formatted_vocab, 
-                flags=re.IGNORECASE
+        # ✅ Step 2-3: Formatted HTML with generic mentions replaced (cached across reruns)
+        with perf_tracer.span("format_vocabulary"):
+            formatted_vocab = render_vocabulary_html(
+                vocab_text,
+                account_name,
+                industry_name,
+                theme=("dark" if st.session_state.dark_mode else "light"),
+                digest=vocab_doc.digest,
             )
 
         # ✅ Step 4: Fallback display names for header
@@ -2298,21 +1341,9 @@ if not st.session_state.get('admin_view_selected', False) or st.session_state.ge
                     name = st.text_input("Your Name")
                     email = st.text_input("Your Email (optional)")
                 
-                    # Extract vocabulary sections dynamically
-                    vocab_text = st.session_state.outputs.get("vocabulary", "")
-                    
-                    # Parse vocabulary to extract Step headings
-                    step_sections = {}
-                    if vocab_text:
-                        # Extract Step N: headings with their content
-                        step_pattern = r'(Step\s*(\d+)\s*:\s*([^\n]+))'
-                        matches = re.finditer(step_pattern, vocab_text, re.IGNORECASE)
-                        
-                        for match in matches:
-                            step_num = match.group(2)
-                            step_title = match.group(3).strip()
-                            step_key = f"Step {step_num}"
-                            step_sections[step_key] = step_title
+                    # Steps and terms come from the vocabulary parsed once per analysis
+                    vocab_doc = get_vocabulary_doc()
+                    step_sections = vocab_doc.titles()
                     
                     # If no steps found or less than 5, create generic options
                     if len(step_sections) == 0:
@@ -2332,29 +1363,8 @@ if not st.session_state.get('admin_view_selected', False) or st.session_state.ge
                         step_key = f"Step {i}"
                         step_title = step_sections.get(step_key, f"Section {i}")
                         
-                        # Extract sub-headings (numbered items under each step)
-                        sub_items = []
-                        if vocab_text:
-                            # Look for numbered items (1. Item, 2. Item, etc.) in the vocabulary
-                            # This will find items like "1. Revenue Growth Rate:", "2. Market Share:", etc.
-                            step_section_match = re.search(
-                                rf'Step\s*{i}\s*:.*?(?=Step\s*\d+\s*:|$)',
-                                vocab_text,
-                                re.IGNORECASE | re.DOTALL
-                            )
-                            
-                            if step_section_match:
-                                step_content = step_section_match.group(0)
-                                # Extract numbered sub-items
-                                sub_item_pattern = r'^\s*(\d+)\.\s+([^:\n]+)'
-                                sub_matches = re.finditer(sub_item_pattern, step_content, re.MULTILINE)
-                                
-                                for sub_match in sub_matches:
-                                    item_text = sub_match.group(2).strip()
-                                    # Clean up any extra formatting
-                                    item_text = re.sub(r'<[^>]+>', '', item_text)  # Remove HTML tags
-                                    item_text = re.sub(r'\*\*([^*]+)\*\*', r'\1', item_text)  # Remove bold markers
-                                    sub_items.append(item_text)
+                        # Numbered sub-items ("1. Revenue Growth Rate:", ...) under this step
+                        sub_items = vocab_doc.term_names(step_key)
                         
                         # If no sub-items found, add just the step heading as an option
                         if not sub_items:
@@ -2462,33 +1472,36 @@ if not st.session_state.get('admin_view_selected', False) or st.session_state.ge
 
         st.markdown("**Would you like to download this vocabulary?**")
 
-        # Get the vocabulary text for download
-        vocab_text = st.session_state.outputs.get("vocabulary", "") if st.session_state.get("analysis_complete", False) else ""
+        # Get the parsed vocabulary for download
+        vocab_doc = get_vocabulary_doc() if st.session_state.get("analysis_complete", False) else None
 
-        if vocab_text:
-            # Create downloadable content
+        if vocab_doc is not None and vocab_doc.text:
             account_name = st.session_state.get("analysis_account", "Unknown Company")
             industry_name = st.session_state.get("analysis_industry", "Unknown Industry")
-            timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-            filename = f"vocabulary_{account_name.replace(' ', '_')}_{timestamp}.txt"
-            
-            # Format the content for download
-            download_content = f"""Vocabulary Export
-    Generated on: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
-    Company: {account_name}
-    Industry: {industry_name}
-
-    {vocab_text}
+            vocab_format = st.radio(
+                "Download format:",
+                options=list(VOCAB_EXPORT_FORMATS),
+                format_func=lambda fmt: VOCAB_EXPORT_FORMATS[fmt][0],
+                horizontal=True,
+                key="vocab_export_format"
+            )
+            format_label, format_ext, format_mime = VOCAB_EXPORT_FORMATS[vocab_format]
+            # One timestamp for both the file name and the "Generated on" header
+            generated_at = datetime.now()
+            filename = f"vocabulary_{account_name.replace(' ', '_')}_{generated_at:%Y-%m-%d_%H-%M-%S}.{format_ext}"
+            vocab_exports = get_vocab_export_cache()
+
+            def build_vocab_download(doc=vocab_doc, fmt=vocab_format, account=account_name, industry=industry_name,
+                                     generated_on=generated_at.strftime("%Y-%m-%d %H:%M:%S")):
+                # Runs only when the button is clicked, on a separate thread: no st.* calls in here
+                body = vocab_exports.get_or_compute((doc.digest, fmt), lambda: build_vocab_body(doc, fmt))
+                return build_vocab_export(doc, fmt, account, industry, generated_on, body=body)
 
-    ---
-    Generated by Vocabulary Analysis Tool
-    """
-            
             st.download_button(
-                label="⬇️ Download Vocabulary as Text File",
-                data=download_content,
+                label=f"⬇️ Download Vocabulary ({format_label})",
+                data=build_vocab_download,
                 file_name=filename,
-                mime="text/plain",
+                mime=format_mime,
                 use_container_width=True
             )
         else:
@@ -2543,66 +1556,237 @@ if st.session_state.get('current_page', '') == 'admin':
         # Admin download options - Full width for feedback report only
         st.markdown("**📋 Feedback Report**")
         
-        # Try to load from file first, fallback to session state (for cloud hosting)
-        df = None
-        if os.path.exists(FEEDBACK_FILE):
-            try:
-                # Read the file with the expected schema, allowing missing columns to be inferred
-                df = pd.read_csv(FEEDBACK_FILE) 
-            except Exception as e:
-                st.warning(f"Could not read feedback file: {e}")
-                df = None
-        
+        # Try the indexed mirror of the file first, fallback to session state (for cloud hosting)
+        feedback_index = get_feedback_index()
+        total_feedback = 0
+        try:
+            with perf_tracer.span("feedback_index_sync"):
+                feedback_index.sync()
+            total_feedback = feedback_index.count()
+        except Exception as e:
+            st.warning(f"Could not read feedback file: {e}")
+
         # Fallback to session state if file not available (Streamlit Cloud)
-        if df is None or df.empty:
+        df = None
+        if not total_feedback:
             if 'feedback_data' in st.session_state and not st.session_state.feedback_data.empty:
                 df = st.session_state.feedback_data.copy()
+                total_feedback = len(df)
                 st.info("📊 Showing feedback from current session (cloud mode)")
-            else:
-                df = None
-
-        if df is not None and not df.empty:
-                # Add filter dropdown
-                filter_option = st.selectbox(
-                    "Filter by feedback type:",
-                    options=[
-                        "All",
-                        "I have read it, found it useful, thanks.",
-                        "I have read it, found some definitions to be off.",
-                        "The widget seems interesting, but I have some suggestions on the features."
-                    ],
-                    key="admin_feedback_filter"
-                )
-                
-                # Apply filter
-                if filter_option == "All":
-                    filtered_df = df.copy()
+
+        if total_feedback:
+                # Filters (pushed down to the index query when reading the file)
+                f1, f2, f3, f4 = st.columns(4)
+                with f1:
+                    filter_option = st.selectbox(
+                        "Filter by feedback type:",
+                        options=[
+                            "All",
+                            "I have read it, found it useful, thanks.",
+                            "I have read it, found some definitions to be off.",
+                            "The widget seems interesting, but I have some suggestions on the features."
+                        ],
+                        key="admin_feedback_filter"
+                    )
+                if df is None:
+                    account_options = feedback_index.distinct("Account")
+                    industry_options = feedback_index.distinct("Industry")
                 else:
-                    filtered_df = df[df['FeedbackType'] == filter_option]
-                
+                    account_options = sorted(df["Account"].dropna().astype(str).unique())
+                    industry_options = sorted(df["Industry"].dropna().astype(str).unique())
+                with f2:
+                    account_filter = st.selectbox("Account:", ["All"] + list(account_options), key="admin_account_filter")
+                with f3:
+                    industry_filter = st.selectbox("Industry:", ["All"] + list(industry_options), key="admin_industry_filter")
+                with f4:
+                    date_range = st.date_input("Date range:", value=(), key="admin_date_filter")
+                feedback_filters = {
+                    "feedback_type": None if filter_option == "All" else filter_option,
+                    "account": None if account_filter == "All" else account_filter,
+                    "industry": None if industry_filter == "All" else industry_filter,
+                    "date_from": date_range[0] if date_range else None,
+                    "date_to": date_range[-1] if date_range else None,
+                }
+
+                if df is None:
+                    matched_feedback = feedback_index.count(**feedback_filters)
+                else:
+                    filtered_df = filter_feedback_frame(df, **feedback_filters)
+                    matched_feedback = len(filtered_df)
+
+                # ---- Pagination: only the visible page is queried and sent to the browser ----
+                p1, p2 = st.columns([1, 3])
+                with p1:
+                    page_size = st.selectbox("Rows per page:", FEEDBACK_PAGE_SIZES, key="admin_page_size")
+                page_count = max(1, -(-matched_feedback // page_size))
+                feedback_view = (tuple(feedback_filters.values()), page_size)
+                if st.session_state.get("admin_feedback_view") != feedback_view:
+                    # New filters or page size: back to the first page
+                    st.session_state.admin_feedback_view = feedback_view
+                    st.session_state.admin_feedback_page = 1
+                with p2:
+                    page = st.number_input(f"Page (of {page_count}):", min_value=1, max_value=page_count, step=1,
+                                           key="admin_feedback_page")
+                page_offset = (page - 1) * page_size
+
+                if df is None:
+                    with perf_tracer.span("feedback_query"):
+                        page_rows = feedback_index.query(
+                            columns=["id"] + feedback_index.columns, limit=page_size, offset=page_offset,
+                            truncate=FEEDBACK_PREVIEW_CHARS, **feedback_filters
+                        )
+                    page_df = pd.DataFrame(page_rows, columns=["id"] + feedback_index.columns).set_index("id")
+                else:
+                    page_df = filtered_df.iloc[page_offset:page_offset + page_size].copy()
+                    for column, limit in FEEDBACK_PREVIEW_CHARS.items():
+                        text = page_df[column].fillna("").astype(str)
+                        page_df[column] = text.where(text.str.len() <= limit, text.str[:limit] + "…")
+
                 # Show count
-                st.info(f"Showing {len(filtered_df)} of {len(df)} feedback entries")
+                if matched_feedback:
+                    st.info(f"Showing {page_offset + 1}–{page_offset + len(page_df)} of {matched_feedback} matching "
+                            f"feedback entries ({total_feedback} total)")
+                else:
+                    st.info(f"No feedback entries match these filters ({total_feedback} total)")
                 
-                # Display filtered feedback data table - fit to full page width
+                # Display the current page of feedback - fit to full page width
                 st.markdown("### 📋 User Feedback")
-                st.dataframe(filtered_df, use_container_width=True, height=500)
-                
+                st.dataframe(page_df, use_container_width=True, height=500)
+
+                # Full problem statement of one row, fetched only for that row
+                if len(page_df):
+                    with st.expander("🔎 Full problem statement"):
+                        feedback_row = st.selectbox(
+                            "Row:",
+                            options=list(page_df.index),
+                            format_func=lambda i: f"{page_df.at[i, 'Timestamp']} · {page_df.at[i, 'Name']} · {page_df.at[i, 'Account']}",
+                            key="admin_feedback_row",
+                        )
+                        if df is None:
+                            full_row = feedback_index.get(feedback_row) or {}
+                            st.text(full_row.get("ProblemStatement", ""))
+                        else:
+                            st.text(str(filtered_df.at[feedback_row, "ProblemStatement"]))
+
                 st.markdown("<br>", unsafe_allow_html=True)
                 
-                # Download filtered feedback
-                feedback_csv = filtered_df.to_csv(index=False).encode("utf-8")
-                download_filename = f"feedback_report_{filter_option.replace(' ', '_').replace('.', '').replace(',', '')}.csv"
-                
+                # Download filtered feedback: generated only when the button is clicked,
+                # streamed chunk by chunk from the index into one in-memory buffer
+                export_format = st.radio(
+                    "Report format:",
+                    options=list(EXPORT_FORMATS),
+                    format_func=lambda fmt: EXPORT_FORMATS[fmt][0],
+                    horizontal=True,
+                    key="admin_export_format"
+                )
+                export_label, export_ext, export_mime = EXPORT_FORMATS[export_format]
+                download_filename = f"feedback_report_{filter_option.replace(' ', '_').replace('.', '').replace(',', '')}.{export_ext}"
+
+                def build_feedback_export(fmt=export_format, filters=dict(feedback_filters), frame=None if df is None else filtered_df):
+                    # Runs on a separate thread when the download is clicked: no st.* calls in here
+                    if frame is None:
+                        return write_export(fmt, feedback_index.columns, feedback_index.iter_chunks(**filters))
+                    return write_export(fmt, list(frame.columns), dataframe_chunks(frame))
+
                 st.download_button(
-                    "⬇️ Download Filtered Feedback Report",
-                    feedback_csv,
+                    f"⬇️ Download Filtered Feedback Report ({export_label})",
+                    build_feedback_export,
                     download_filename,
-                    "text/csv",
+                    export_mime,
                     use_container_width=True
                 )
         else:
             st.info("No feedback data available yet. Submit feedback from the main page to see it here.")
 
+        # ---- Per-analysis result backups ----
+        st.markdown("**🗂️ Analysis Backups**")
+        result_store = get_result_store()
+        backups = result_store.recent(limit=50)
+        if backups:
+            backups_df = pd.DataFrame(backups)
+            backups_df["created"] = pd.to_datetime(backups_df["created"], unit="s").dt.strftime("%Y-%m-%d %H:%M:%S")
+            st.dataframe(backups_df, use_container_width=True, hide_index=True)
+            backup_job = st.selectbox(
+                "View backed-up vocabulary:",
+                options=[b["job_id"] for b in backups],
+                format_func=lambda job_id: next(
+                    f"{b['account']} · {b['industry']} · {job_id[:8]}" for b in backups if b["job_id"] == job_id
+                ),
+                key="admin_backup_job",
+            )
+            backup = result_store.get(backup_job) if backup_job else None
+            if backup:
+                with st.expander("Problem statement & vocabulary"):
+                    st.markdown(f"**Problem:** {backup['problem']}")
+                    st.text(backup["vocabulary"] or "")
+        else:
+            st.info("No analysis backups yet.")
+        store_stats = result_store.stats()
+        st.caption(f"{store_stats['entries']} backups kept for {result_store.ttl_seconds // 3600} h · "
+                   f"{store_stats['pending']} pending writes · {store_stats['write_errors']} failed writes")
+
+        # Shared Talos connection pool health
+        st.markdown("**🔌 Talos Connection Pool**")
+        talos_client = get_talos_client()
+        pool_stats = talos_client.session.stats()
+        m1, m2, m3, m4 = st.columns(4)
+        m1.metric("Requests", pool_stats["requests"])
+        m2.metric("New connections", pool_stats["new_connections"])
+        m3.metric("Reused", pool_stats["reused"])
+        m4.metric("Reuse rate", f"{pool_stats['reuse_rate']:.0%}")
+        st.caption(f"Transport: {pool_stats['transport']}")
+        breaker_states = talos_client.breaker_states()
+        if breaker_states:
+            st.caption("Circuit breakers: " + ", ".join(f"{url} → {state}" for url, state in breaker_states.items()))
+        sched_stats = get_request_scheduler().stats()
+        s1, s2, s3, s4 = st.columns(4)
+        s1.metric("Queued", sched_stats["queued"])
+        s2.metric("In flight", sched_stats["in_flight"])
+        s3.metric("Deduplicated", sched_stats["coalesced"])
+        s4.metric("Completed", sched_stats["completed"])
+        st.caption(f"Rate limit: {sched_stats['rate_per_sec']:g}/s per tenant & agency (burst {sched_stats['burst']:g}), "
+                   f"{sched_stats['max_inflight']} concurrent requests")
+        extraction_flight = get_extraction_singleflight()
+        st.caption(f"Shared extractions: {extraction_flight.followers} joined an identical in-flight analysis "
+                   f"({extraction_flight.leaders} ran upstream, {extraction_flight.in_flight()} running now)")
+        job_stats = get_extraction_jobs().stats()
+        st.caption("Background jobs: " + ", ".join(f"{count} {status}" for status, count in job_stats.items()))
+
+        # ---- Theme CSS delivery ----
+        st.markdown("**🎨 Theme CSS**")
+        css_stats = get_theme_bundle("dark" if st.session_state.dark_mode else "light").stats()
+        c1, c2, c3, c4 = st.columns(4)
+        c1.metric("Source CSS", f"{css_stats['source_bytes'] / 1024:.1f} KB")
+        c2.metric("Minified", f"{css_stats['minified_bytes'] / 1024:.1f} KB")
+        c3.metric("Sent per rerun", f"{css_stats['rerun_bytes'] / 1024:.1f} KB")
+        c4.metric("Saved on first load", f"{css_stats['saved_first_load'] / 1024:.1f} KB")
+        st.caption(f"Theme: {css_stats['theme']} · hash {css_stats['digest']} · "
+                   "reruns reuse the browser's cached copy when the stylesheet is unchanged")
+
+        # ---- Per-rerun performance traces (this session) ----
+        st.markdown("**⏱️ Performance Traces**")
+        perf_summary = perf_tracer.summary()
+        if perf_summary:
+            st.dataframe(pd.DataFrame(perf_summary), use_container_width=True, hide_index=True)
+            st.caption(f"Last {len(perf_tracer.spans())} spans of this session across {perf_tracer.rerun} reruns")
+            st.download_button(
+                "⬇️ Download Performance Trace (CSV)",
+                perf_tracer.to_csv().encode("utf-8"),
+                f"perf_trace_{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}.csv",
+                "text/csv",
+                use_container_width=True
+            )
+        else:
+            st.info("No performance spans recorded yet.")
+
     elif password and password != "":
         st.session_state.admin_authenticated = False
         st.error("❌ Invalid password. Access denied.")
+
+# Whole-script timing (reruns cut short by st.rerun()/st.stop() are not counted)
+perf_tracer.record("rerun_total", (time.perf_counter() - rerun_started) * 1000)
+
+# No st.fragment: poll a running extraction job by rerunning once the page is drawn
+if st.session_state.pop("job_poll_pending", False):
+    time.sleep(JOB_POLL_SECONDS)
+    st.rerun()
@@ -0,0 +1,202 @@
+"""Headless batch extraction over the same pipeline as the Streamlit page.
+
+Reads (problem, account) rows from a CSV or JSONL file, runs every agency in
+API_CONFIGS for each row with bounded concurrency and appends one JSON line per
+row to the output file. Results also land in the shared result cache, so the
+UI serves those problem statements instantly afterwards.
+
+    python batch_extract.py problems.csv results.jsonl --concurrency 4
+
+Input columns (CSV header or JSONL keys): "problem" (or "problem_statement" /
+"ProblemStatement"), "account" (or "Account") and an optional "industry";
+aliases such as "J&J" resolve to the registry's account name (accounts.json)
+and a missing industry comes from ACCOUNT_INDUSTRY_MAP.
+
+The output file doubles as the checkpoint: rerunning the same command skips
+rows that already have an "ok" record and retries the ones that failed.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from agency_pipeline import SOURCE_CACHE, SOURCE_ERROR, agency_cache_key, extract_agency, run_agencies
+from result_cache import make_cache_key, open_result_cache
+from talos_client import PooledTransport, TalosClient
+from talos_scheduler import RequestScheduler
+from vocab_config import API_CONFIGS, build_full_context, build_headers, canonical_account, industry_for
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CONCURRENCY = 4
+
+PROBLEM_COLUMNS = ("problem", "problem_statement", "ProblemStatement")
+ACCOUNT_COLUMNS = ("account", "Account")
+INDUSTRY_COLUMNS = ("industry", "Industry")
+
+STATUS_OK = "ok"
+STATUS_ERROR = "error"
+
+
+def _first(row, columns):
+    for column in columns:
+        value = row.get(column)
+        if value is not None and str(value).strip():
+            return str(value).strip()
+    return ""
+
+
+def read_rows(path):
+    """Yield (row_no, problem, account, industry) from a .csv or .jsonl/.json file"""
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        if path.lower().endswith((".jsonl", ".json", ".ndjson")):
+            records = (json.loads(line) for line in f if line.strip())
+        else:
+            records = csv.DictReader(f)
+        for row_no, row in enumerate(records, start=1):
+            problem = _first(row, PROBLEM_COLUMNS)
+            account = canonical_account(_first(row, ACCOUNT_COLUMNS) or "Others")
+            industry = _first(row, INDUSTRY_COLUMNS) or industry_for(account)
+            yield row_no, problem, account, industry
+
+
+def row_id(problem, account, industry):
+    """Stable id for a row (same normalization as the result cache keys)"""
+    return make_cache_key(problem, account, industry, "batch", "")
+
+
+def load_checkpoint(output_path):
+    """Ids of rows already extracted successfully in a previous run"""
+    done = set()
+    if not os.path.exists(output_path):
+        return done
+    with open(output_path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # a line cut short by an interrupted run
+            if record.get("status") == STATUS_OK:
+                done.add(record.get("id"))
+    return done
+
+
+class JsonlWriter:
+    """Thread-safe appender; every record is flushed and fsynced so a crash loses at most one row"""
+
+    def __init__(self, path):
+        self._lock = threading.Lock()
+        self._file = open(path, "a", encoding="utf-8")
+
+    def write(self, record):
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def close(self):
+        self._file.close()
+
+
+def extract_row(problem, account, industry, client, cache, headers, scheduler=None):
+    """Run every configured agency for one problem; returns {name: (text, source)}"""
+    full_context = build_full_context(problem, account, industry)
+
+    def run_agency(api_cfg, dep_outputs, emit):
+        cache_key = agency_cache_key(api_cfg, problem, account, industry, dep_outputs)
+        return extract_agency(api_cfg, full_context, dep_outputs, cache_key, client, cache, headers,
+                              scheduler=scheduler)
+
+    return run_agencies(API_CONFIGS, run_agency)
+
+
+def run_batch(input_path, output_path, concurrency=DEFAULT_CONCURRENCY, limit=None, log=print):
+    """Extract every pending row; returns counters for the run"""
+    done_ids = load_checkpoint(output_path)
+    pending = []
+    seen = set()
+    stats = {"rows": 0, "skipped": 0, "ok": 0, "errors": 0, "cache_hits": 0}
+    for row_no, problem, account, industry in read_rows(input_path):
+        stats["rows"] += 1
+        if not problem:
+            log(f"row {row_no}: no problem statement, skipped")
+            stats["skipped"] += 1
+            continue
+        rid = row_id(problem, account, industry)
+        if rid in done_ids or rid in seen:
+            stats["skipped"] += 1
+            continue
+        seen.add(rid)
+        pending.append((row_no, rid, problem, account, industry))
+    if limit is not None:
+        pending = pending[:limit]
+    log(f"{len(pending)} rows to extract ({stats['skipped']} already done or skipped)")
+
+    client = TalosClient(session=PooledTransport())
+    # Same per tenant/agency rate limit as the app (TALOS_RATE_PER_SEC / TALOS_RATE_BURST)
+    scheduler = RequestScheduler()
+    cache = open_result_cache(BASE_DIR)
+    headers = build_headers()
+    writer = JsonlWriter(output_path)
+
+    def work(item):
+        row_no, rid, problem, account, industry = item
+        started = time.perf_counter()
+        try:
+            results = extract_row(problem, account, industry, client, cache, headers, scheduler)
+            outputs = {name: text for name, (text, _) in results.items()}
+            sources = {name: source for name, (_, source) in results.items()}
+            status = STATUS_ERROR if SOURCE_ERROR in sources.values() else STATUS_OK
+        except Exception as e:  # a bad row must not stop the batch
+            outputs, sources, status = {}, {}, STATUS_ERROR
+            outputs["error"] = f"Error: {e}"
+        record = {
+            "id": rid,
+            "row": row_no,
+            "account": account,
+            "industry": industry,
+            "problem": problem,
+            "status": status,
+            "outputs": outputs,
+            "sources": sources,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000),
+        }
+        writer.write(record)
+        return record
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+            futures = [executor.submit(work, item) for item in pending]
+            for n, future in enumerate(as_completed(futures), start=1):
+                record = future.result()
+                stats["ok" if record["status"] == STATUS_OK else "errors"] += 1
+                stats["cache_hits"] += sum(1 for s in record["sources"].values() if s == SOURCE_CACHE)
+                log(f"[{n}/{len(pending)}] row {record['row']} ({record['account']}): "
+                    f"{record['status']} in {record['elapsed_ms']} ms")
+    finally:
+        writer.close()
+        client.session.close()
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input", help="CSV or JSONL file of problem statements")
+    parser.add_argument("output", help="JSONL results file (also the resume checkpoint)")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help="rows extracted in parallel (default: %(default)s)")
+    parser.add_argument("--limit", type=int, default=None, help="extract at most this many pending rows")
+    args = parser.parse_args(argv)
+
+    stats = run_batch(args.input, args.output, args.concurrency, args.limit)
+    print(f"done: {stats['ok']} ok, {stats['errors']} errors, {stats['skipped']} skipped, "
+          f"{stats['cache_hits']} agency results from cache")
+    return 1 if stats["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+"""Micro-benchmark for vocab_text.sanitize_text.
+
+Checks that the precompiled sanitizer produces exactly the same output as the
+original 16-pass implementation on a golden corpus, then reports throughput
+(MB/s) for both on large multi-step vocabularies.
+
+    python benchmarks/bench_sanitize.py [--steps 400] [--repeat 5]
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vocab_text import sanitize_text  # noqa: E402
+
+
+def legacy_sanitize_text(text):
+    """The original implementation, kept verbatim as the reference"""
+    if not text:
+        return ""
+    text = re.sub(r'^\s*s\s+', '', text.strip())
+    text = re.sub(r'\n\s*s\s+', '\n', text)
+    text = re.sub(r'Q\d+\s*Answer\s*Explanation\s*:', '', text, flags=re.IGNORECASE)
+    text = re.sub(r'\*\*(.*?)\*\*', r'\1', text)
+    text = re.sub(r'\*(.*?)\*', r'\1', text)
+    text = re.sub(r'`(.*?)`', r'\1', text)
+    text = re.sub(r'#+\s*', '', text)
+    text = re.sub(r'!\[.*?\]\(.*?\)', '', text)
+    text = re.sub(r'\[(.*?)\]\(.*?\)', r'\1', text)
+    text = re.sub(r'\n{3,}', '\n\n', text)
+    text = re.sub(r' {2,}', ' ', text)
+    text = re.sub(r'^\s*[-*]\s+', '• ', text, flags=re.MULTILINE)
+    text = re.sub(r'<\/?[^>]+>', '', text)
+    text = re.sub(r'&', '&', text)
+    text = re.sub(r'& Key Takeaway:', 'Key Takeaway:', text)
+    return text.strip()
+
+
+GOLDEN_CASES = [
+    "",
+    "   ",
+    "s Step 1: KPIs",
+    "Intro\n  s  stray s\ns\tanother",
+    "Q1 Answer Explanation: text\nq12answerexplanation:x",
+    "***a***",
+    "**bold** and *italic* and `code`",
+    "## Heading\n### Sub #tag",
+    "![img](http://x/y.png) and [link](http://x) [not a link]",
+    "a\n\n\n\n\nb   c    d",
+    "- one\n* two\n\n\n  - three\n-not a bullet",
+    "<b>Revenue</b> <br/> &amp; <a href='x'>y</a>",
+    "Risk & Key Takeaway: keep it & more",
+    "Step 2:\n1. Term: definition with ** unmatched\n2. Other * term",
+]
+
+TERMS = ["Revenue Growth Rate", "Customer Churn", "Net Promoter Score", "Market Share",
+         "Gross Margin", "Demand Forecast", "Inventory Turnover", "Price Elasticity"]
+
+
+def make_vocabulary(steps, seed=0, markdown=True):
+    """A synthetic multi-step vocabulary, optionally full of markdown artifacts"""
+    rng = random.Random(seed)
+    out = []
+    for step in range(1, steps + 1):
+        heading = f"Step {step}: {rng.choice(TERMS)} Context"
+        out.append(f"### **{heading}**" if markdown else heading)
+        for n in range(1, 6):
+            term = rng.choice(TERMS)
+            definition = " ".join(rng.choice(["the company", "tracks", "industry", "growth", "over", "time",
+                                              "revenue", "customers", "and", "quarterly"]) for _ in range(18))
+            if markdown:
+                out.append(f"{n}. **{term}**: {definition} (see [docs](http://example.com/{n}))")
+                out.append(f"  - *note*: `{term.lower()}`  uses   <em>weighted</em> data")
+            else:
+                out.append(f"{n}. {term}: {definition}")
+        out.append("\n\n")
+    return "\n".join(out)
+
+
+def throughput(fn, text, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(text)
+        best = min(best, time.perf_counter() - start)
+    return len(text.encode("utf-8")) / best / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--steps", type=int, default=400)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    corpus = GOLDEN_CASES + [make_vocabulary(s, seed=s, markdown=m) for s in (1, 5, 25) for m in (True, False)]
+    mismatches = [case for case in corpus if sanitize_text(case) != legacy_sanitize_text(case)]
+    print(f"golden corpus: {len(corpus) - len(mismatches)}/{len(corpus)} identical")
+    if mismatches:
+        for case in mismatches[:5]:
+            print("  MISMATCH:", repr(case[:80]))
+        sys.exit(1)
+
+    for label, markdown in (("markdown-heavy", True), ("clean", False)):
+        text = make_vocabulary(args.steps, markdown=markdown)
+        old = throughput(legacy_sanitize_text, text, args.repeat)
+        new = throughput(sanitize_text, text, args.repeat)
+        size_mb = len(text.encode("utf-8")) / 1e6
+        print(f"{label:>15} ({size_mb:.2f} MB): legacy {old:7.1f} MB/s | current {new:7.1f} MB/s | x{new / old:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Background extraction jobs.
+
+An analysis is submitted as a job to a process-wide worker pool instead of
+running inline in the Streamlit script. The page keeps only the job id (in
+session state and the ?job= query parameter), polls the job for progress and
+picks up the finished result. Because jobs live in the process rather than in
+the session, a browser refresh or a dropped websocket reattaches to the same
+job instead of paying for another Talos call.
+
+Finished jobs are kept for EXTRACTION_JOB_TTL seconds (default one hour).
+"""
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_JOB_WORKERS = int(os.environ.get("EXTRACTION_JOB_WORKERS", 8))
+DEFAULT_JOB_TTL = int(os.environ.get("EXTRACTION_JOB_TTL", 3600))
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+
+
+class ExtractionJob:
+    """State of one background extraction; updated by its worker, read by the page"""
+
+    def __init__(self, meta):
+        self.job_id = uuid.uuid4().hex
+        self.meta = dict(meta)
+        self.status = JOB_QUEUED
+        self.created = time.time()
+        self.finished = None
+        self.results = None
+        self.error = None
+        # progress reported while running (see update())
+        self.done = 0
+        self.total = 0
+        self.note = ""
+        self.preview_caption = ""
+        self.preview_html = ""
+        self._lock = threading.Lock()
+
+    def update(self, **fields):
+        with self._lock:
+            for name, value in fields.items():
+                setattr(self, name, value)
+
+    def snapshot(self):
+        """Consistent copy of the progress fields for rendering"""
+        with self._lock:
+            return {
+                "status": self.status,
+                "done": self.done,
+                "total": self.total,
+                "note": self.note,
+                "preview_caption": self.preview_caption,
+                "preview_html": self.preview_html,
+                "error": self.error,
+            }
+
+    @property
+    def is_finished(self):
+        return self.status in (JOB_DONE, JOB_FAILED)
+
+
+class ExtractionJobs:
+    """Worker pool plus in-memory job store, shared by every session"""
+
+    def __init__(self, max_workers=DEFAULT_JOB_WORKERS, ttl_seconds=DEFAULT_JOB_TTL):
+        self.ttl_seconds = ttl_seconds
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="extraction-job")
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, target, meta=None):
+        """Run target(job) on the pool; its return value becomes job.results"""
+        job = ExtractionJob(meta or {})
+        with self._lock:
+            self._purge()
+            self._jobs[job.job_id] = job
+        self._executor.submit(self._run, job, target)
+        return job
+
+    def _run(self, job, target):
+        job.update(status=JOB_RUNNING)
+        try:
+            results = target(job)
+        except Exception as e:
+            job.update(status=JOB_FAILED, error=str(e), finished=time.time())
+        else:
+            job.update(status=JOB_DONE, results=results, finished=time.time())
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id) if job_id else None
+
+    def _purge(self):
+        cutoff = time.time() - self.ttl_seconds
+        expired = [job_id for job_id, job in self._jobs.items() if job.finished and job.finished < cutoff]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def stats(self):
+        with self._lock:
+            counts = {JOB_QUEUED: 0, JOB_RUNNING: 0, JOB_DONE: 0, JOB_FAILED: 0}
+            for job in self._jobs.values():
+                counts[job.status] += 1
+        return counts
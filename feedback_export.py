@@ -0,0 +1,73 @@
+"""Streamed exports of the admin feedback report.
+
+Rows arrive in chunks (FeedbackIndex.iter_chunks() or a DataFrame split into
+slices) and are encoded straight into one in-memory buffer, so the report is
+not built as a full string and then copied to bytes. The app passes these
+writers to st.download_button as callables, so nothing is generated until an
+admin actually clicks download.
+
+Parquet needs pyarrow (optional); without it only the CSV formats are offered.
+"""
+import csv
+import gzip
+import io
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+EXPORT_CHUNK_ROWS = 2000
+
+# format -> (label, file extension, MIME type)
+EXPORT_FORMATS = {
+    "csv": ("CSV", "csv", "text/csv"),
+    "csv.gz": ("CSV (gzip)", "csv.gz", "application/gzip"),
+}
+if pa is not None:
+    EXPORT_FORMATS["parquet"] = ("Parquet", "parquet", "application/vnd.apache.parquet")
+
+
+def dataframe_chunks(df, chunk_size=EXPORT_CHUNK_ROWS):
+    """Yield a DataFrame's rows as lists of tuples, chunk_size rows at a time"""
+    for start in range(0, len(df), chunk_size):
+        yield list(df.iloc[start:start + chunk_size].itertuples(index=False, name=None))
+
+
+def _write_csv(out, columns, chunks):
+    text = io.TextIOWrapper(out, encoding="utf-8", newline="")
+    writer = csv.writer(text, lineterminator="\n")  # same row endings as the old df.to_csv() export
+    writer.writerow(columns)
+    for rows in chunks:
+        writer.writerows(["" if v is None else v for v in row] for row in rows)
+    text.flush()
+    text.detach()  # leave `out` open for the caller
+
+
+def _write_parquet(out, columns, chunks):
+    schema = pa.schema([(column, pa.string()) for column in columns])
+    with pq.ParquetWriter(out, schema, compression="zstd") as writer:
+        for rows in chunks:
+            data = [[None if row[i] is None else str(row[i]) for row in rows] for i in range(len(columns))]
+            writer.write_table(pa.Table.from_arrays([pa.array(col, pa.string()) for col in data], schema=schema))
+
+
+def write_export(fmt, columns, chunks):
+    """Write the rows in `fmt` ('csv', 'csv.gz' or 'parquet') and return them as a rewound BytesIO.
+
+    BytesIO is one of the types Streamlit accepts from a download callable.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {fmt}")
+    out = io.BytesIO()
+    if fmt == "csv":
+        _write_csv(out, columns, chunks)
+    elif fmt == "csv.gz":
+        with gzip.GzipFile(fileobj=out, mode="wb", mtime=0) as gz:
+            _write_csv(gz, columns, chunks)
+    else:
+        _write_parquet(out, columns, chunks)
+    out.seek(0)
+    return out
@@ -0,0 +1,227 @@
+"""Queryable SQLite mirror of feedback.csv for the admin section.
+
+feedback.csv stays the source of truth (FeedbackStore appends to it). The
+admin view reads this mirror instead of re-parsing the whole CSV on every
+rerun:
+
+* sync() is a no-op while the CSV's size and mtime are unchanged,
+* otherwise only the bytes appended since the last sync are parsed, under the
+  FeedbackStore lock so a half-written row is never seen; a rewritten file
+  (header migration, manual edit) triggers a full rebuild,
+* filters run as indexed SQL (FeedbackType, Account, Industry, Timestamp), so
+  only matching rows and the requested columns come back.
+"""
+import csv
+import io
+import os
+import sqlite3
+import threading
+from datetime import date, datetime, timedelta
+
+from result_cache import open_in_cache_dir
+
+INDEX_FILE_NAME = "feedback_index.sqlite3"
+INDEXED_COLUMNS = ("FeedbackType", "Account", "Industry", "Timestamp")
+
+
+def _quoted(columns):
+    return ", ".join(f'"{c}"' for c in columns)
+
+
+def _select_list(columns, truncate):
+    """Quoted column list; columns in `truncate` are cut to that many characters (plus '…')"""
+    parts = []
+    for column in columns:
+        limit = truncate.get(column)
+        if limit:
+            parts.append(f'CASE WHEN length("{column}") > {int(limit)} '
+                         f'THEN substr("{column}", 1, {int(limit)}) || \'…\' ELSE "{column}" END')
+        else:
+            parts.append(f'"{column}"')
+    return ", ".join(parts)
+
+
+def _day(value):
+    """'YYYY-MM-DD' for a date/datetime/string (Timestamps sort as text)"""
+    if isinstance(value, (date, datetime)):
+        return value.strftime("%Y-%m-%d")
+    return str(value)[:10]
+
+
+def build_where(feedback_type=None, account=None, industry=None, date_from=None, date_to=None):
+    """SQL WHERE clause and parameters for the admin filters (None = no filter; date_to is inclusive)"""
+    clauses, params = [], []
+    for column, value in (("FeedbackType", feedback_type), ("Account", account), ("Industry", industry)):
+        if value:
+            clauses.append(f"{column} = ?")
+            params.append(value)
+    if date_from:
+        clauses.append("Timestamp >= ?")
+        params.append(_day(date_from))
+    if date_to:
+        end = date_to if isinstance(date_to, date) else datetime.strptime(_day(date_to), "%Y-%m-%d").date()
+        clauses.append("Timestamp < ?")
+        params.append(_day(end + timedelta(days=1)))
+    return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+
+class FeedbackIndex:
+    """Incrementally synced SQLite copy of a FeedbackStore's CSV"""
+
+    def __init__(self, store, db_path):
+        self.store = store
+        self.db_path = db_path
+        self.columns = list(store.columns)
+        self._lock = threading.Lock()
+        self._seen_stat = None  # (size, mtime_ns) of the CSV at the last sync
+        self.full_rebuilds = 0
+        self.rows_synced = 0
+        self._conn = sqlite3.connect(db_path, timeout=10, check_same_thread=False)
+        with self._lock:
+            if db_path != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS sync_state ("
+                " id INTEGER PRIMARY KEY CHECK (id = 1),"
+                " csv_path TEXT, inode INTEGER, byte_offset INTEGER, header TEXT)"
+            )
+            self._create_table()
+            self._conn.commit()
+
+    def _create_table(self):
+        column_sql = ", ".join(f'"{c}" TEXT' for c in self.columns)
+        self._conn.execute(f"CREATE TABLE IF NOT EXISTS feedback (id INTEGER PRIMARY KEY, {column_sql})")
+        for column in INDEXED_COLUMNS:
+            self._conn.execute(f'CREATE INDEX IF NOT EXISTS idx_feedback_{column.lower()} ON feedback("{column}")')
+
+    # ---- Sync ----
+    def sync(self):
+        """Bring the mirror up to date with the CSV; returns the number of new rows"""
+        try:
+            st_csv = os.stat(self.store.path)
+        except OSError:
+            return 0
+        stat_key = (st_csv.st_size, st_csv.st_mtime_ns)
+        if stat_key == self._seen_stat:
+            return 0  # unchanged since the last sync
+        with self.store.locked(), self._lock:
+            st_csv = os.stat(self.store.path)
+            state = self._conn.execute(
+                "SELECT csv_path, inode, byte_offset, header FROM sync_state WHERE id = 1"
+            ).fetchone()
+            with open(self.store.path, "rb") as f:
+                header_line = f.readline()
+                rebuild = (
+                    state is None
+                    or state[0] != self.store.path
+                    or state[1] != st_csv.st_ino
+                    or state[2] > st_csv.st_size
+                    or state[3] != header_line.decode("utf-8", "replace")
+                )
+                if rebuild:
+                    self._conn.execute("DELETE FROM feedback")
+                    offset = len(header_line)
+                    self.full_rebuilds += 1
+                else:
+                    offset = state[2]
+                f.seek(offset)
+                tail = f.read()
+            header = next(csv.reader([header_line.decode("utf-8", "replace")]), [])
+            added = self._insert(tail, header)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sync_state (id, csv_path, inode, byte_offset, header) VALUES (1, ?, ?, ?, ?)",
+                (self.store.path, st_csv.st_ino, offset + len(tail), header_line.decode("utf-8", "replace")),
+            )
+            self._conn.commit()
+            self._seen_stat = (st_csv.st_size, st_csv.st_mtime_ns)
+            self.rows_synced += added
+            return added
+
+    def _insert(self, data, header):
+        if not data:
+            return 0
+        reader = csv.reader(io.StringIO(data.decode("utf-8", "replace"), newline=""))
+        if header == self.columns:
+            width = len(self.columns)
+            rows = [(row + [""] * width)[:width] for row in reader if row]
+        else:
+            # Legacy header (e.g. before 'ProblemStatement'): map by name, missing columns are ''
+            rows = [[dict(zip(header, row)).get(c, "") for c in self.columns] for row in reader if row]
+        placeholders = ", ".join("?" for _ in self.columns)
+        self._conn.executemany(f"INSERT INTO feedback ({_quoted(self.columns)}) VALUES ({placeholders})", rows)
+        return len(rows)
+
+    # ---- Queries ----
+    def query(self, columns=None, limit=None, offset=0, truncate=None, **filters):
+        """Matching rows (oldest first, like the CSV) as a list of tuples in `columns` order.
+
+        `columns` may include "id" (the row's stable id, see get()); `truncate`
+        maps long text columns to a preview length so only the page's previews
+        leave the database.
+        """
+        columns = list(columns or self.columns)
+        unknown = [c for c in columns if c != "id" and c not in self.columns]
+        if unknown:
+            raise ValueError(f"Unknown feedback columns: {unknown}")
+        where, params = build_where(**filters)
+        sql = f"SELECT {_select_list(columns, truncate or {})} FROM feedback{where} ORDER BY id"
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params += [limit, offset]
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def iter_chunks(self, chunk_size=1000, **filters):
+        """Yield matching rows (all columns) in lists of up to chunk_size.
+
+        Keyset pagination on id: the lock is held per chunk only, and memory
+        stays at one chunk however many rows match.
+        """
+        where, params = build_where(**filters)
+        where += (" AND" if where else " WHERE") + " id > ?"
+        sql = f"SELECT id, {_quoted(self.columns)} FROM feedback{where} ORDER BY id LIMIT ?"
+        last_id = 0
+        while True:
+            with self._lock:
+                rows = self._conn.execute(sql, params + [last_id, chunk_size]).fetchall()
+            if not rows:
+                return
+            last_id = rows[-1][0]
+            yield [row[1:] for row in rows]
+            if len(rows) < chunk_size:
+                return
+
+    def get(self, row_id):
+        """One full row as a dict (None if missing)"""
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {_quoted(self.columns)} FROM feedback WHERE id = ?", (row_id,)
+            ).fetchone()
+        return dict(zip(self.columns, row)) if row else None
+
+    def count(self, **filters):
+        where, params = build_where(**filters)
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM feedback{where}", params).fetchone()[0]
+
+    def distinct(self, column):
+        """Sorted non-empty values of one column (for filter dropdowns)"""
+        if column not in self.columns:
+            raise ValueError(f"Unknown feedback column: {column}")
+        with self._lock:
+            rows = self._conn.execute(
+                f'SELECT DISTINCT "{column}" FROM feedback WHERE "{column}" != \'\' ORDER BY "{column}"'
+            ).fetchall()
+        return [r[0] for r in rows]
+
+    def stats(self):
+        with self._lock:
+            count = self._conn.execute("SELECT COUNT(*) FROM feedback").fetchone()[0]
+        return {"rows": count, "rows_synced": self.rows_synced, "full_rebuilds": self.full_rebuilds,
+                "path": self.db_path}
+
+
+def open_feedback_index(store, base_dir):
+    """Open the mirror next to the result cache, falling back to the temp dir and then memory"""
+    return open_in_cache_dir(base_dir, INDEX_FILE_NAME, lambda path: FeedbackIndex(store, path))
@@ -0,0 +1,127 @@
+"""Append-only, process-safe storage for feedback.csv.
+
+Each submission appends exactly one CSV row under an exclusive file lock
+instead of re-reading and rewriting the whole file, so writes are O(1) and
+concurrent sessions (or app processes) can no longer drop each other's rows.
+"""
+import csv
+import io
+import os
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+FEEDBACK_COLUMNS = [
+    "Timestamp", "Name", "Email", "Feedback", "FeedbackType", "OffDefinitions",
+    "Suggestions", "Account", "Industry", "ProblemStatement",
+]
+
+
+def _csv_line(values):
+    buf = io.StringIO()
+    csv.writer(buf, lineterminator="\n").writerow(["" if v is None else v for v in values])
+    return buf.getvalue()
+
+
+class FeedbackStore:
+    """CSV feedback file with locked O(1) appends and one-time schema migration"""
+
+    def __init__(self, path, columns=FEEDBACK_COLUMNS):
+        self.path = path
+        self.lock_path = path + ".lock"
+        self.columns = list(columns)
+        # flock is per open file description, so threads of this process
+        # also need their own lock
+        self._thread_lock = threading.Lock()
+
+    @contextmanager
+    def locked(self):
+        """Hold an exclusive lock shared by all threads and processes using this file"""
+        with self._thread_lock:
+            with open(self.lock_path, "a+b") as lock_file:
+                if fcntl is not None:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+                elif msvcrt is not None:
+                    lock_file.seek(0)
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+                try:
+                    yield
+                finally:
+                    if fcntl is not None:
+                        fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+                    elif msvcrt is not None:
+                        lock_file.seek(0)
+                        msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def ensure_file(self):
+        """Create the file with a header if missing and migrate an outdated header"""
+        with self.locked():
+            self._prepare()
+
+    def append(self, values):
+        """Append one feedback row (a dict keyed by column or a list in column order)"""
+        if isinstance(values, dict):
+            values = [values.get(col, "") for col in self.columns]
+        line = _csv_line(values).encode("utf-8")
+        with self.locked():
+            self._prepare()
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND)
+            try:
+                # A crash mid-write can leave the last row unterminated; start on a fresh line
+                if self._needs_newline():
+                    line = b"\n" + line
+                os.write(fd, line)
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
+    def _needs_newline(self):
+        size = os.path.getsize(self.path)
+        if size == 0:
+            return False
+        with open(self.path, "rb") as f:
+            f.seek(size - 1)
+            return f.read(1) != b"\n"
+
+    def _prepare(self):
+        # Caller must hold the lock
+        if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+            self._atomic_write(_csv_line(self.columns))
+            return
+        with open(self.path, "r", encoding="utf-8", newline="") as f:
+            header = next(csv.reader(f), [])
+        if header != self.columns:
+            self._migrate(header)
+
+    def _migrate(self, header):
+        """Rewrite the file once so it matches the current column order.
+
+        Handles files written before 'ProblemStatement' existed: missing
+        columns are filled with '' (same as the old read-modify-write path).
+        """
+        with open(self.path, "r", encoding="utf-8", newline="") as f:
+            reader = csv.reader(f)
+            next(reader, None)
+            rows = [dict(zip(header, row)) for row in reader if row]
+        out = io.StringIO()
+        writer = csv.writer(out, lineterminator="\n")
+        writer.writerow(self.columns)
+        for row in rows:
+            writer.writerow([row.get(col, "") for col in self.columns])
+        self._atomic_write(out.getvalue())
+
+    def _atomic_write(self, content):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8", newline="") as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,98 @@
+"""Lightweight per-session performance tracing.
+
+Code paths wrap their stages in tracer.span("stage"); each finished span is
+appended to a bounded ring buffer, so a long-lived session keeps only its
+most recent timings. The admin section summarizes the buffer as p50/p95/p99
+per stage and exports the raw spans as CSV.
+
+Spans may be recorded from worker threads (the agency pipeline), so the
+buffer is guarded by a lock.
+"""
+import csv
+import io
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+
+DEFAULT_MAX_SPANS = int(os.environ.get("PERF_TRACE_MAX_SPANS", 2000))
+SPAN_COLUMNS = ["Timestamp", "Rerun", "Stage", "DurationMs"]
+
+
+def percentile(sorted_values, pct):
+    """Linearly interpolated percentile (0-100) of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    pos = (len(sorted_values) - 1) * pct / 100.0
+    lower = int(pos)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (pos - lower)
+
+
+class PerfTracer:
+    """Ring buffer of timed spans for one Streamlit session"""
+
+    def __init__(self, max_spans=DEFAULT_MAX_SPANS):
+        self._spans = deque(maxlen=max_spans)
+        self._lock = threading.Lock()
+        self.rerun = 0
+
+    def start_rerun(self):
+        """Mark the start of a script run; spans are tagged with the rerun number"""
+        self.rerun += 1
+        return self.rerun
+
+    def record(self, stage, duration_ms):
+        with self._lock:
+            self._spans.append((datetime.now().isoformat(timespec="milliseconds"), self.rerun, stage,
+                                round(duration_ms, 3)))
+
+    @contextmanager
+    def span(self, stage):
+        """Time the enclosed block as one span of `stage` (recorded even if it raises)"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, (time.perf_counter() - start) * 1000)
+
+    def spans(self):
+        with self._lock:
+            return list(self._spans)
+
+    def clear(self):
+        with self._lock:
+            self._spans.clear()
+
+    def summary(self):
+        """One row per stage (in first-seen order) with count and p50/p95/p99/max in ms"""
+        by_stage = {}
+        for _, _, stage, duration_ms in self.spans():
+            by_stage.setdefault(stage, []).append(duration_ms)
+        rows = []
+        for stage, durations in by_stage.items():
+            durations.sort()
+            rows.append({
+                "Stage": stage,
+                "Count": len(durations),
+                "p50 (ms)": round(percentile(durations, 50), 2),
+                "p95 (ms)": round(percentile(durations, 95), 2),
+                "p99 (ms)": round(percentile(durations, 99), 2),
+                "Max (ms)": round(durations[-1], 2),
+            })
+        return rows
+
+    def to_csv(self):
+        """Raw spans as CSV text"""
+        out = io.StringIO()
+        writer = csv.writer(out)
+        writer.writerow(SPAN_COLUMNS)
+        writer.writerows(self.spans())
+        return out.getvalue()
+
+
+def maybe_span(tracer, stage):
+    """tracer.span(stage), or a no-op context when tracing is off (tracer is None)"""
+    return tracer.span(stage) if tracer is not None else nullcontext()
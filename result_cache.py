@@ -0,0 +1,193 @@
+"""Persistent, content-addressed cache for Talos agency results.
+
+Results are keyed by a hash of the *normalized* request inputs (problem text,
+account, industry and the API config name/URL), so repeat and near-repeat
+analyses (same text with different casing/whitespace) are served from disk
+instead of waiting on another LLM round trip.
+
+Storage is a small SQLite file with TTL expiry and LRU-style size eviction.
+LRUCache is the in-memory counterpart used to memoize rendered output.
+"""
+import hashlib
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+DEFAULT_TTL_SECONDS = int(os.environ.get("VOCAB_CACHE_TTL", 7 * 24 * 3600))
+DEFAULT_MAX_ENTRIES = int(os.environ.get("VOCAB_CACHE_MAX_ENTRIES", 2000))
+CACHE_DIR_NAME = ".vocab_cache"
+CACHE_FILE_NAME = "results.sqlite3"
+
+
+def normalize_text(text):
+    """Normalize text so trivially different inputs share a cache entry"""
+    if not text:
+        return ""
+    text = unicodedata.normalize("NFKC", str(text))
+    return " ".join(text.casefold().split())
+
+
+def make_cache_key(problem_text, account, industry, api_name, api_url, *extra):
+    """Build a stable hash key from the normalized request inputs"""
+    parts = [
+        normalize_text(problem_text),
+        normalize_text(account),
+        normalize_text(industry),
+        str(api_name or ""),
+        str(api_url or ""),
+    ]
+    parts.extend(str(x) for x in extra)
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """SQLite-backed key/value cache with TTL and max-entry eviction.
+
+    A single connection is shared across Streamlit script threads and guarded
+    by a lock, which also makes the ":memory:" fallback behave.
+    """
+
+    def __init__(self, path, ttl_seconds=DEFAULT_TTL_SECONDS, max_entries=DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._conn = sqlite3.connect(path, timeout=10, check_same_thread=False)
+        with self._lock:
+            if path != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                " key TEXT PRIMARY KEY,"
+                " value TEXT NOT NULL,"
+                " created REAL NOT NULL,"
+                " accessed REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_results_accessed ON results(accessed)")
+            self._conn.commit()
+
+    def get(self, key, allow_stale=False):
+        """Return the cached value for key, or None if missing/expired.
+
+        allow_stale=True also returns expired entries (used as a fallback
+        when the upstream API is unavailable).
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created FROM results WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or (not allow_stale and now - row[1] > self.ttl_seconds):
+                self._misses += 1
+                return None
+            self._conn.execute("UPDATE results SET accessed = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self._hits += 1
+            return row[0]
+
+    def set(self, key, value):
+        """Store value under key and evict expired / least recently used entries"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results (key, value, created, accessed) VALUES (?, ?, ?, ?)",
+                (key, value, now, now),
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now):
+        self._conn.execute("DELETE FROM results WHERE created < ?", (now - self.ttl_seconds,))
+        count = self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        if count > self.max_entries:
+            self._conn.execute(
+                "DELETE FROM results WHERE key IN ("
+                " SELECT key FROM results ORDER BY accessed ASC LIMIT ?)",
+                (count - self.max_entries,),
+            )
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM results")
+            self._conn.commit()
+
+    def stats(self):
+        """Entry count plus hit/miss counters for this process"""
+        with self._lock:
+            count = self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        return {"entries": count, "hits": self._hits, "misses": self._misses, "path": self.path}
+
+
+def open_in_cache_dir(base_dir, file_name, opener):
+    """opener(path) for file_name in the first usable cache directory, else opener(":memory:").
+
+    Directories are tried in order: VOCAB_CACHE_DIR, <base_dir>/.vocab_cache,
+    then the temp dir. Streamlit Cloud mounts the app directory read-only, so
+    the app-side location may not be writable; opener raising OSError or
+    sqlite3.Error moves on to the next one.
+    """
+    candidates = [
+        os.environ.get("VOCAB_CACHE_DIR"),
+        os.path.join(base_dir, CACHE_DIR_NAME),
+        os.path.join(tempfile.gettempdir(), CACHE_DIR_NAME),
+    ]
+    for cache_dir in candidates:
+        if not cache_dir:
+            continue
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            return opener(os.path.join(cache_dir, file_name))
+        except (PermissionError, OSError, sqlite3.Error):
+            continue
+    return opener(":memory:")
+
+
+def open_result_cache(base_dir, ttl_seconds=DEFAULT_TTL_SECONDS, max_entries=DEFAULT_MAX_ENTRIES):
+    """Open the cache next to the app, falling back to the temp dir and then memory"""
+    return open_in_cache_dir(base_dir, CACHE_FILE_NAME, lambda path: ResultCache(path, ttl_seconds, max_entries))
+
+
+class LRUCache:
+    """Small thread-safe in-memory LRU map for per-process memoization"""
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return default
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def get_or_compute(self, key, compute):
+        """Return the cached value for key, computing and storing it on a miss"""
+        sentinel = object()
+        value = self.get(key, sentinel)
+        if value is sentinel:
+            value = compute()
+            self.set(key, value)
+        return value
+
+    def __len__(self):
+        return len(self._data)
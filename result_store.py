@@ -0,0 +1,124 @@
+"""Per-analysis result backups for the admin section.
+
+Every finished extraction is kept as one row keyed by its job id (plus the
+Streamlit session that ran it), so concurrent users no longer overwrite a
+single shared backup file. Writes are handed to a background writer thread
+(write-behind), which batches them into one transaction and deletes rows
+older than the TTL; nothing on the request path waits for the disk.
+
+Storage sits next to the result cache (see result_cache.open_in_cache_dir)
+with the same temp-dir and in-memory fallbacks.
+"""
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+from result_cache import open_in_cache_dir
+
+DEFAULT_BACKUP_TTL_SECONDS = int(os.environ.get("RESULT_BACKUP_TTL", 7 * 24 * 3600))
+STORE_FILE_NAME = "result_backups.sqlite3"
+BACKUP_COLUMNS = ["job_id", "session_id", "created", "account", "industry", "problem", "vocabulary"]
+
+
+class ResultStore:
+    """SQLite table of analysis results with an asynchronous writer"""
+
+    def __init__(self, path, ttl_seconds=DEFAULT_BACKUP_TTL_SECONDS):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._pending = queue.Queue()
+        self._conn = sqlite3.connect(path, timeout=10, check_same_thread=False)
+        self.written = 0
+        self.write_errors = 0
+        with self._lock:
+            if path != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS backups ("
+                " job_id TEXT PRIMARY KEY,"
+                " session_id TEXT NOT NULL,"
+                " created REAL NOT NULL,"
+                " account TEXT,"
+                " industry TEXT,"
+                " problem TEXT,"
+                " vocabulary TEXT)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_backups_created ON backups(created)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_backups_session ON backups(session_id)")
+            self._conn.commit()
+        self._writer = threading.Thread(target=self._write_loop, name="result-store-writer", daemon=True)
+        self._writer.start()
+
+    def save(self, job_id, session_id, account, industry, problem, vocabulary):
+        """Queue a backup row; returns immediately"""
+        self._pending.put((job_id, session_id, time.time(), account, industry, problem, vocabulary))
+
+    def _write_loop(self):
+        while True:
+            batch = [self._pending.get()]
+            # Drain whatever else piled up so a burst is one transaction
+            while True:
+                try:
+                    batch.append(self._pending.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                with self._lock:
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO backups"
+                        " (job_id, session_id, created, account, industry, problem, vocabulary)"
+                        " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        batch,
+                    )
+                    self._conn.execute("DELETE FROM backups WHERE created < ?", (time.time() - self.ttl_seconds,))
+                    self._conn.commit()
+                self.written += len(batch)
+            except sqlite3.Error:
+                self.write_errors += len(batch)  # a backup is best effort, like the old temp file
+            finally:
+                for _ in batch:
+                    self._pending.task_done()
+
+    def flush(self):
+        """Block until every queued backup has been written"""
+        self._pending.join()
+
+    def get(self, job_id):
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {', '.join(BACKUP_COLUMNS)} FROM backups WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        return dict(zip(BACKUP_COLUMNS, row)) if row else None
+
+    def recent(self, limit=50, session_id=None):
+        """Newest backups first (without the full texts), optionally for one session"""
+        columns = ["job_id", "session_id", "created", "account", "industry", "length(vocabulary)"]
+        sql = f"SELECT {', '.join(columns)} FROM backups"
+        params = []
+        if session_id is not None:
+            sql += " WHERE session_id = ?"
+            params.append(session_id)
+        sql += " ORDER BY created DESC LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [
+            {"job_id": r[0], "session_id": r[1], "created": r[2], "account": r[3], "industry": r[4],
+             "vocabulary_chars": r[5] or 0}
+            for r in rows
+        ]
+
+    def stats(self):
+        with self._lock:
+            count = self._conn.execute("SELECT COUNT(*) FROM backups").fetchone()[0]
+        return {"entries": count, "pending": self._pending.qsize(), "written": self.written,
+                "write_errors": self.write_errors, "path": self.path}
+
+
+def open_result_store(base_dir, ttl_seconds=DEFAULT_BACKUP_TTL_SECONDS):
+    """Open the backup store next to the app, falling back to the temp dir and then memory"""
+    return open_in_cache_dir(base_dir, STORE_FILE_NAME, lambda path: ResultStore(path, ttl_seconds))
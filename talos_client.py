@@ -0,0 +1,472 @@
+"""Resilient HTTP client for the Talos agency endpoints.
+
+Wraps the reasoning_api POST with bounded connect/read timeouts, jittered
+exponential retry on 429/5xx and connection errors, and a per-endpoint
+circuit breaker so a stalled or failing agency cannot pin script threads.
+"""
+import json
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from vocab_text import json_to_text
+
+# Optional: httpx + h2 give us HTTP/2 multiplexing to the Talos host
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+DEFAULT_CONNECT_TIMEOUT = float(os.environ.get("TALOS_CONNECT_TIMEOUT", 5))
+DEFAULT_READ_TIMEOUT = float(os.environ.get("TALOS_READ_TIMEOUT", 120))
+DEFAULT_TOTAL_DEADLINE = float(os.environ.get("TALOS_TOTAL_DEADLINE", 240))
+DEFAULT_MAX_RETRIES = int(os.environ.get("TALOS_MAX_RETRIES", 3))
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+POOL_CONNECTIONS = int(os.environ.get("TALOS_POOL_CONNECTIONS", 4))
+POOL_MAXSIZE = int(os.environ.get("TALOS_POOL_MAXSIZE", 32))
+KEEPALIVE_EXPIRY = float(os.environ.get("TALOS_KEEPALIVE_EXPIRY", 60))
+
+NETWORK_ERRORS = (requests.ConnectionError, requests.Timeout)
+if httpx is not None:
+    NETWORK_ERRORS = NETWORK_ERRORS + (httpx.TransportError,)
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised without calling upstream while an endpoint's breaker is open"""
+
+
+class CircuitBreaker:
+    """Classic closed -> open -> half-open breaker.
+
+    After failure_threshold consecutive failures the breaker opens and calls
+    fail fast for reset_timeout seconds; then a single trial call is let
+    through and its outcome closes or re-opens the breaker.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                self._trial_in_flight = False
+            if self.state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._trial_in_flight = False
+
+    def release(self):
+        """Finish a call that was neither a success nor a failure (e.g. HTTP 429)"""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._trial_in_flight = False
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+
+def _counting_pool_classes(pool_classes, on_connect):
+    """Copy urllib3's pool classes with a ConnectionCls that reports each TCP connect"""
+    counted = {}
+    for scheme, pool_cls in pool_classes.items():
+        base_conn = pool_cls.ConnectionCls
+
+        def connect(self, _base=base_conn):
+            on_connect()
+            return _base.connect(self)
+
+        conn_cls = type(base_conn.__name__, (base_conn,), {"connect": connect})
+        counted[scheme] = type(pool_cls.__name__, (pool_cls,), {"ConnectionCls": conn_cls})
+    return counted
+
+
+class _CountingAdapter(HTTPAdapter):
+    def __init__(self, on_connect, **kwargs):
+        self._on_connect = on_connect
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = _counting_pool_classes(
+            self.poolmanager.pool_classes_by_scheme, self._on_connect
+        )
+
+
+class PooledTransport:
+    """Keep-alive connection pool meant to be shared by every session of the app.
+
+    Uses httpx with HTTP/2 when httpx and h2 are installed, otherwise a
+    requests.Session with a sized urllib3 pool. Both are thread-safe for
+    concurrent POSTs. Tracks how many requests reused an open connection.
+    """
+
+    def __init__(self, pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE,
+                 keepalive_expiry=KEEPALIVE_EXPIRY, http2=True):
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._new_connections = 0
+        self._client = None
+        self._session = None
+        if http2 and httpx is not None:
+            try:
+                self._client = httpx.Client(
+                    http2=True,
+                    limits=httpx.Limits(
+                        max_connections=pool_maxsize,
+                        max_keepalive_connections=pool_maxsize,
+                        keepalive_expiry=keepalive_expiry,
+                    ),
+                )
+            except ImportError:
+                # httpx without the h2 extra
+                self._client = None
+        if self._client is None:
+            self._session = requests.Session()
+            adapter = _CountingAdapter(
+                self._count_connection,
+                pool_connections=pool_connections,
+                pool_maxsize=pool_maxsize,
+                max_retries=0,
+            )
+            self._session.mount("https://", adapter)
+            self._session.mount("http://", adapter)
+
+    @property
+    def kind(self):
+        return "httpx (HTTP/2)" if self._client is not None else "requests (HTTP/1.1 keep-alive)"
+
+    def _count_connection(self):
+        with self._lock:
+            self._new_connections += 1
+
+    def _trace(self, event_name, info):
+        if event_name == "connection.connect_tcp.complete":
+            self._count_connection()
+
+    def post(self, url, headers=None, json=None, timeout=None):
+        with self._lock:
+            self._requests += 1
+        if self._client is not None:
+            connect, read = timeout if isinstance(timeout, tuple) else (timeout, timeout)
+            return self._client.post(
+                url,
+                headers=headers,
+                json=json,
+                timeout=httpx.Timeout(read, connect=connect),
+                extensions={"trace": self._trace},
+            )
+        return self._session.post(url, headers=headers, json=json, timeout=timeout)
+
+    @contextmanager
+    def stream(self, url, headers=None, json=None, timeout=None):
+        """POST and yield (status_code, response headers, iterator of decoded text chunks)"""
+        with self._lock:
+            self._requests += 1
+        if self._client is not None:
+            connect, read = timeout if isinstance(timeout, tuple) else (timeout, timeout)
+            with self._client.stream(
+                "POST",
+                url,
+                headers=headers,
+                json=json,
+                timeout=httpx.Timeout(read, connect=connect),
+                extensions={"trace": self._trace},
+            ) as resp:
+                yield resp.status_code, resp.headers, resp.iter_text()
+            return
+        with _requests_stream(self._session, url, headers, json, timeout) as opened:
+            yield opened
+
+    def stats(self):
+        """Request / new-connection counters and the resulting reuse rate"""
+        with self._lock:
+            requests_sent = self._requests
+            new_connections = self._new_connections
+        reused = max(0, requests_sent - new_connections)
+        return {
+            "transport": self.kind,
+            "requests": requests_sent,
+            "new_connections": new_connections,
+            "reused": reused,
+            "reuse_rate": (reused / requests_sent) if requests_sent else 0.0,
+        }
+
+    def close(self):
+        if self._client is not None:
+            self._client.close()
+        if self._session is not None:
+            self._session.close()
+
+
+@contextmanager
+def _requests_stream(session, url, headers, payload, timeout):
+    poster = session.post if session is not None else requests.post
+    resp = poster(url, headers=headers, json=payload, timeout=timeout, stream=True)
+    try:
+        # SSE / chunked text often comes without a charset
+        resp.encoding = resp.encoding or "utf-8"
+        yield resp.status_code, resp.headers, resp.iter_content(chunk_size=None, decode_unicode=True)
+    finally:
+        resp.close()
+
+
+class StreamDecoder:
+    """Turn a streamed response body into displayable text pieces.
+
+    - text/event-stream: each SSE event's data (JSON data goes through
+      json_to_text); a "[DONE]" event is ignored
+    - JSON: nothing is shown until the body is complete (partial JSON is not
+      displayable); finish() returns the parsed object
+    - anything else: chunks are passed through as plain text
+    """
+
+    def __init__(self, content_type):
+        content_type = (content_type or "").lower()
+        if "text/event-stream" in content_type:
+            self.mode = "sse"
+        elif "json" in content_type:
+            self.mode = "json"
+        else:
+            self.mode = "text"
+        self._buffer = ""
+        self._data_lines = []
+        self._parts = []
+
+    def feed(self, chunk):
+        """Consume a decoded chunk; return the new text pieces it completes"""
+        if self.mode != "sse":
+            self._parts.append(chunk)
+            return [chunk] if self.mode == "text" and chunk else []
+        self._buffer += chunk
+        pieces = []
+        while "\n" in self._buffer:
+            line, self._buffer = self._buffer.split("\n", 1)
+            line = line.rstrip("\r")
+            if line.startswith("data:"):
+                value = line[5:]
+                self._data_lines.append(value[1:] if value.startswith(" ") else value)
+            elif not line and self._data_lines:
+                piece = self._event_text("\n".join(self._data_lines))
+                self._data_lines = []
+                if piece:
+                    self._parts.append(piece)
+                    pieces.append(piece)
+        return pieces
+
+    def _event_text(self, data):
+        if data.strip() == "[DONE]":
+            return ""
+        try:
+            return json_to_text(json.loads(data))
+        except ValueError:
+            return data
+
+    def finish(self):
+        """Return the full payload: parsed JSON object or the concatenated text"""
+        if self.mode == "sse":
+            self.feed("\n\n")
+        body = "".join(self._parts)
+        if self.mode == "json":
+            return json.loads(body) if body.strip() else None
+        return body
+
+
+def _endpoint(url):
+    # Breakers are per agency endpoint, ignoring the query string
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}{parts.path}"
+
+
+def _retry_after(headers):
+    """Seconds from a Retry-After header (delta-seconds form), else None"""
+    value = headers.get("Retry-After") if headers is not None else None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+class TalosClient:
+    """POST helper shared by all sessions (breaker state is process-wide).
+
+    session may be a requests.Session or a PooledTransport; without one every
+    call opens a fresh connection.
+    """
+
+    def __init__(
+        self,
+        session=None,
+        connect_timeout=DEFAULT_CONNECT_TIMEOUT,
+        read_timeout=DEFAULT_READ_TIMEOUT,
+        total_deadline=DEFAULT_TOTAL_DEADLINE,
+        max_retries=DEFAULT_MAX_RETRIES,
+        backoff_base=0.5,
+        backoff_max=8.0,
+        failure_threshold=5,
+        reset_timeout=30.0,
+    ):
+        self.session = session
+        self.timeout = (connect_timeout, read_timeout)
+        self.total_deadline = total_deadline
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    def breaker(self, url):
+        key = _endpoint(url)
+        with self._lock:
+            if key not in self._breakers:
+                self._breakers[key] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+            return self._breakers[key]
+
+    def breaker_states(self):
+        with self._lock:
+            return {k: b.state for k, b in self._breakers.items()}
+
+    def _backoff(self, attempt):
+        # "Full jitter": uniform in [0, min(max, base * 2^attempt)]
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def _send(self, url, headers, payload, session):
+        session = session or self.session
+        poster = session.post if session is not None else requests.post
+        return poster(url, headers=headers, json=payload, timeout=self.timeout)
+
+    def _open_stream(self, url, headers, payload, session):
+        session = session or self.session
+        if isinstance(session, PooledTransport):
+            return session.stream(url, headers=headers, json=payload, timeout=self.timeout)
+        return _requests_stream(session, url, headers, payload, self.timeout)
+
+    def stream_post(self, url, headers, payload, on_text, session=None):
+        """POST payload and pass decoded text pieces to on_text as they arrive.
+
+        Returns (status_code, payload) where payload is the full decoded body
+        (see StreamDecoder.finish) or None for non-200 responses. Retries and
+        the circuit breaker work as in post(), but only until the first byte
+        of a 200 response: a stream that breaks midway raises.
+        """
+        breaker = self.breaker(url)
+        deadline = time.monotonic() + self.total_deadline
+        attempt = 0
+        while True:
+            if not breaker.allow():
+                raise CircuitOpenError(f"Circuit open for {_endpoint(url)}")
+            status, resp_headers, error = None, None, None
+            try:
+                with self._open_stream(url, headers, payload, session) as (status, resp_headers, chunks):
+                    if status == 200:
+                        decoder = StreamDecoder(resp_headers.get("Content-Type", ""))
+                        for chunk in chunks:
+                            for piece in decoder.feed(chunk):
+                                on_text(piece)
+                        body = decoder.finish()
+                        breaker.record_success()
+                        return status, body
+                    for _ in chunks:
+                        pass  # drain so the connection can be reused
+            except NETWORK_ERRORS as e:
+                if status == 200:
+                    breaker.record_failure()
+                    raise
+                error = e
+            except BaseException:
+                # Anything else (broken chunked body, decode error, on_text raising) must
+                # still settle the call, or a half-open trial would block the endpoint for good
+                breaker.record_failure()
+                raise
+
+            if error is None and status not in RETRY_STATUSES:
+                breaker.record_success()
+                return status, None
+            if error is not None or status >= 500:
+                breaker.record_failure()
+            else:
+                breaker.release()
+
+            delay = _retry_after(resp_headers)
+            if delay is None:
+                delay = self._backoff(attempt)
+            attempt += 1
+            if attempt > self.max_retries or time.monotonic() + delay >= deadline:
+                if error is not None:
+                    raise error
+                return status, None
+            time.sleep(delay)
+
+    def post(self, url, headers, payload, session=None):
+        """POST payload as JSON and return the final requests.Response.
+
+        Retries 429/5xx and connection/timeout errors with backoff while the
+        total deadline allows. Raises CircuitOpenError when the endpoint's
+        breaker is open, and re-raises the last network error otherwise.
+        """
+        breaker = self.breaker(url)
+        deadline = time.monotonic() + self.total_deadline
+        attempt = 0
+        while True:
+            if not breaker.allow():
+                raise CircuitOpenError(f"Circuit open for {_endpoint(url)}")
+            resp, error = None, None
+            try:
+                resp = self._send(url, headers, payload, session)
+            except NETWORK_ERRORS as e:
+                error = e
+            except BaseException:
+                # Anything unexpected must still settle the call, or a half-open trial
+                # would block the endpoint for good
+                breaker.record_failure()
+                raise
+
+            retryable = error is not None or resp.status_code in RETRY_STATUSES
+            if not retryable:
+                breaker.record_success()
+                return resp
+            if error is not None or resp.status_code >= 500:
+                breaker.record_failure()
+            else:
+                # Rate limiting is back-pressure, not an outage
+                breaker.release()
+
+            delay = _retry_after(resp.headers if resp is not None else None)
+            if delay is None:
+                delay = self._backoff(attempt)
+            attempt += 1
+            if attempt > self.max_retries or time.monotonic() + delay >= deadline:
+                if error is not None:
+                    raise error
+                return resp
+            time.sleep(delay)
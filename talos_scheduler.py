@@ -0,0 +1,245 @@
+"""Process-wide scheduler for Talos agency calls.
+
+Every session's agency calls go through one RequestScheduler so the process as
+a whole stays within the API's sustainable rate instead of bursting into 429s:
+
+* a FIFO queue served by a fixed number of dispatcher threads (max_inflight),
+* a token bucket per (tenant, agency), refilled at `rate` calls per second
+  with up to `burst` calls saved up (a rate <= 0 turns the limit off),
+* single-flight: a call whose key is already queued or running joins that
+  call and shares its result instead of issuing a duplicate request.
+
+Callers block in Ticket.wait(), which can report the ticket's queue position
+while it waits (shown next to the analysis spinner).
+
+SingleFlight is the same coalescing without the queue, for whole extractions
+(several rounds of calls) rather than single requests.
+"""
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+
+DEFAULT_RATE = float(os.environ.get("TALOS_RATE_PER_SEC", 2.0))
+DEFAULT_BURST = float(os.environ.get("TALOS_RATE_BURST", 5))
+DEFAULT_MAX_INFLIGHT = int(os.environ.get("TALOS_MAX_INFLIGHT", 8))
+
+
+class TokenBucket:
+    """Token bucket; not locked itself (the scheduler holds its lock).
+
+    A rate <= 0 means unlimited: such a bucket could never refill, so it
+    always hands out a token instead of stalling its queue for good.
+    """
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.capacity = max(1.0, burst)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_acquire(self, now=None):
+        if self.rate <= 0:
+            return True
+        self._refill(time.monotonic() if now is None else now)
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+    def wait_time(self):
+        """Seconds until the next token is available"""
+        if self.tokens >= 1 or self.rate <= 0:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class Ticket:
+    """Handle for a scheduled call (shared by every caller joined to it)"""
+
+    def __init__(self, scheduler, key, bucket_key, fn):
+        self.key = key
+        self.bucket_key = bucket_key
+        self.fn = fn
+        self.future = Future()
+        self.waiters = 1
+        self._scheduler = scheduler
+
+    def position(self):
+        """1-based place in the queue, or 0 once the call is running/done"""
+        return self._scheduler.position(self)
+
+    def wait(self, on_position=None, poll_interval=0.25):
+        """Block until the call finishes and return its result (or raise its error).
+
+        on_position(n) is called whenever the queue position changes while
+        waiting (n == 0 means the request is being sent).
+        """
+        last = None
+        while True:
+            if on_position is not None:
+                pos = self.position()
+                if pos != last:
+                    on_position(pos)
+                    last = pos
+            try:
+                return self.future.result(timeout=poll_interval)
+            except FutureTimeoutError:
+                continue
+
+
+class RequestScheduler:
+    """Rate-limited, deduplicating FIFO executor shared by all sessions"""
+
+    def __init__(self, rate=DEFAULT_RATE, burst=DEFAULT_BURST, max_inflight=DEFAULT_MAX_INFLIGHT):
+        self.rate = rate
+        self.burst = burst
+        self.max_inflight = max(1, max_inflight)
+        self._cond = threading.Condition()
+        self._queue = deque()
+        self._by_key = {}  # single-flight: key -> queued or running Ticket
+        self._buckets = {}
+        self._workers = []
+        self._running = 0
+        self._stats = {"submitted": 0, "coalesced": 0, "completed": 0, "failed": 0, "throttled_waits": 0}
+
+    def submit(self, key, bucket_key, fn):
+        """Queue fn() (or join an identical in-flight call) and return its Ticket"""
+        with self._cond:
+            self._stats["submitted"] += 1
+            ticket = self._by_key.get(key) if key is not None else None
+            if ticket is not None:
+                ticket.waiters += 1
+                self._stats["coalesced"] += 1
+                return ticket
+            ticket = Ticket(self, key, bucket_key, fn)
+            if key is not None:
+                self._by_key[key] = ticket
+            self._queue.append(ticket)
+            self._ensure_workers()
+            self._cond.notify()
+            return ticket
+
+    def run(self, key, bucket_key, fn, on_position=None):
+        """submit() + wait(): run fn() under the rate limit and return its result"""
+        return self.submit(key, bucket_key, fn).wait(on_position)
+
+    def position(self, ticket):
+        with self._cond:
+            for index, queued in enumerate(self._queue):
+                if queued is ticket:
+                    return index + 1
+            return 0
+
+    def _bucket(self, bucket_key):
+        bucket = self._buckets.get(bucket_key)
+        if bucket is None:
+            bucket = self._buckets[bucket_key] = TokenBucket(self.rate, self.burst)
+        return bucket
+
+    def _ensure_workers(self):
+        self._workers = [w for w in self._workers if w.is_alive()]
+        while len(self._workers) < self.max_inflight:
+            worker = threading.Thread(target=self._work, name=f"talos-scheduler-{len(self._workers)}", daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+    def _next_ticket(self):
+        """Oldest queued ticket whose bucket has a token (called with the lock held)"""
+        while True:
+            now = time.monotonic()
+            wait = None
+            for ticket in self._queue:
+                bucket = self._bucket(ticket.bucket_key)
+                if bucket.try_acquire(now):
+                    self._queue.remove(ticket)
+                    self._running += 1
+                    return ticket
+                bucket_wait = bucket.wait_time()
+                wait = bucket_wait if wait is None else min(wait, bucket_wait)
+            if wait is not None:
+                self._stats["throttled_waits"] += 1
+            self._cond.wait(timeout=wait)
+
+    def _work(self):
+        while True:
+            with self._cond:
+                ticket = self._next_ticket()
+            try:
+                result = ticket.fn()
+            except BaseException as e:
+                self._finish(ticket, "failed")
+                ticket.future.set_exception(e)
+            else:
+                self._finish(ticket, "completed")
+                ticket.future.set_result(result)
+
+    def _finish(self, ticket, outcome):
+        # Unregister before resolving the future: later identical calls start fresh
+        with self._cond:
+            if ticket.key is not None and self._by_key.get(ticket.key) is ticket:
+                del self._by_key[ticket.key]
+            self._running -= 1
+            self._stats[outcome] += 1
+
+    def stats(self):
+        with self._cond:
+            return dict(
+                self._stats,
+                queued=len(self._queue),
+                in_flight=self._running,
+                rate_per_sec=self.rate,
+                burst=self.burst,
+                max_inflight=self.max_inflight,
+            )
+
+
+class SingleFlight:
+    """Run fn() once per key among concurrent callers; the others wait for its result"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.leaders = 0
+        self.followers = 0
+
+    def do(self, key, fn, on_join=None):
+        """Return (result, shared): shared is True when another caller's run was joined.
+
+        on_join() is called before a follower starts waiting. Exceptions raised
+        by the leader's fn() are re-raised in every caller.
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+                self.leaders += 1
+            else:
+                self.followers += 1
+        if not leader:
+            if on_join is not None:
+                on_join()
+            return future.result(), True
+        try:
+            result = fn()
+        except BaseException as e:
+            self._done(key)
+            future.set_exception(e)
+            raise
+        self._done(key)
+        future.set_result(result)
+        return result, False
+
+    def _done(self, key):
+        with self._lock:
+            self._calls.pop(key, None)
+
+    def in_flight(self):
+        with self._lock:
+            return len(self._calls)
@@ -0,0 +1,101 @@
+"""Local stand-in for the Talos reasoning_api, for trying the app offline.
+
+    python tools/stub_talos_server.py --port 8765 --mode sse
+    TALOS_ENGINE_URL=http://127.0.0.1:8765/talos-engine TALOS_STREAM=1 streamlit run app.py
+
+Modes:
+  json     - one JSON body ({"result": ...}) after --delay seconds (today's API)
+  sse      - text/event-stream, one "data:" event per line of the vocabulary
+  chunked  - plain text with chunked transfer encoding, one chunk per line
+  error    - HTTP 503 (exercises retries and the circuit breaker)
+"""
+import argparse
+import json
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+SAMPLE_VOCABULARY = """Step 1: Key Performance Indicators (KPIs)
+1. Revenue Growth Rate: Percentage change in the company's revenue over a period.
+2. Customer Churn Rate: Share of customers who stop buying within a period.
+
+Step 2: Technical Definitions
+1. Demand Forecasting: Predicting future customer demand from historical data.
+2. Price Elasticity: How sensitive demand is to changes in price.
+
+Step 3: Industry Context
+1. Market Share: The company's share of total sales in the industry.
+
+Step 4: Business Metrics
+1. Customer Acquisition Cost (CAC): Average spend to win one new customer.
+
+Step 5: Strategic Implications
+Improving retention and pricing discipline protects revenue growth in a competitive industry.
+"""
+
+
+class StubTalosHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    mode = "json"
+    delay = 0.2
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_chunk(self, text):
+        data = text.encode("utf-8")
+        self.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        json.loads(self.rfile.read(length) or b"{}")
+
+        if self.mode == "error":
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        if self.mode == "json":
+            time.sleep(self.delay)
+            body = json.dumps({"result": SAMPLE_VOCABULARY}).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+
+        content_type = "text/event-stream" if self.mode == "sse" else "text/plain; charset=utf-8"
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for line in SAMPLE_VOCABULARY.splitlines(keepends=True):
+            time.sleep(self.delay)
+            if self.mode == "sse":
+                self._send_chunk(f"data: {json.dumps({'content': line})}\n\n")
+            else:
+                self._send_chunk(line)
+        if self.mode == "sse":
+            self._send_chunk("data: [DONE]\n\n")
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--mode", choices=["json", "sse", "chunked", "error"], default="json")
+    parser.add_argument("--delay", type=float, default=0.2, help="seconds per line (or before the JSON body)")
+    args = parser.parse_args()
+
+    StubTalosHandler.mode = args.mode
+    StubTalosHandler.delay = args.delay
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), StubTalosHandler)
+    print(f"Stub Talos listening on http://127.0.0.1:{args.port}/talos-engine ({args.mode})")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
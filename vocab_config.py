@@ -0,0 +1,80 @@
+"""Configuration shared by the Streamlit app and the batch CLI.
+
+Talos endpoints and headers, the account -> industry mapping (with the
+ordered ACCOUNTS / INDUSTRIES lists used by the dropdowns, loaded from
+accounts.json) and the agencies in API_CONFIGS. Nothing in here imports Streamlit.
+"""
+import os
+
+from account_registry import load_account_registry
+
+# -----------------------------
+# Talos endpoint & auth
+# -----------------------------
+TENANT_ID = "talos"
+AUTH_TOKEN = None
+HEADERS_BASE = {"Content-Type": "application/json"}
+# Override to point the app at another Talos deployment (or tools/stub_talos_server.py)
+TALOS_ENGINE_URL = os.environ.get("TALOS_ENGINE_URL", "https://eoc.mu-sigma.com/talos-engine").rstrip("/")
+# Read agency responses incrementally (SSE / chunked) and render terms as they arrive
+TALOS_STREAM = os.environ.get("TALOS_STREAM", "").lower() in ("1", "true", "yes")
+
+
+# -----------------------------
+# Accounts & industries (accounts.json, see account_registry.py)
+# -----------------------------
+ACCOUNT_REGISTRY = load_account_registry()
+ACCOUNT_INDUSTRY_MAP = ACCOUNT_REGISTRY.industry_map
+PRIORITY_ACCOUNTS = ACCOUNT_REGISTRY.priority
+OTHER_ACCOUNTS = ACCOUNT_REGISTRY.others  # alphabetical, 'Others' last
+ACCOUNTS = ACCOUNT_REGISTRY.accounts
+INDUSTRIES = ACCOUNT_REGISTRY.industries
+
+# === API CONFIGURATION ===
+# Agencies run concurrently. An agency that needs another's output lists it in
+# "depends_on": [...] and receives it through prompt(problem, outputs).
+API_CONFIGS = [
+    {
+        "name": "vocabulary",
+        "url": f"{TALOS_ENGINE_URL}/agency/reasoning_api?society_id=1757657318406&agency_id=1758548233201&level=1",
+        "multiround_convo":3,  # up to 3 refinement rounds, stops early once output converges
+        "stream": TALOS_STREAM,
+        "description": "vocabulary",
+        "prompt": lambda problem, outputs: (
+            f"{problem}\n\nExtract the vocabulary from this problem statement."
+        )
+    }
+]
+
+
+def build_headers():
+    """Request headers for the Talos agencies (tenant + optional bearer token)"""
+    headers = HEADERS_BASE.copy()
+    headers.update({"Tenant-ID": TENANT_ID, "X-Tenant-ID": TENANT_ID})
+    if AUTH_TOKEN:
+        headers["Authorization"] = f"Bearer {AUTH_TOKEN}"
+    return headers
+
+
+def build_full_context(problem_text, account, industry):
+    """The context block sent to the agencies; kept byte-identical to what the page has always sent"""
+    return (
+        "\n"
+        "            Business Problem:\n"
+        f"            {problem_text.strip()}\n"
+        "\n"
+        "            Context:\n"
+        f"            Account: {account}\n"
+        f"            Industry: {industry}\n"
+        "            "
+    )
+
+
+def canonical_account(account):
+    """Registry spelling of an account given by name or alias (unchanged if unknown)"""
+    return ACCOUNT_REGISTRY.resolve(account) or account
+
+
+def industry_for(account):
+    """Industry mapped to an account name or alias ('Other' for unknown accounts)"""
+    return ACCOUNT_REGISTRY.industry_for(account)
@@ -0,0 +1,173 @@
+"""Download payloads for an extracted vocabulary.
+
+build_vocab_export() turns a VocabularyDoc into the bytes of one download
+format. The app calls it lazily (from st.download_button's data callable), so
+reruns after an analysis no longer rebuild or re-register the payload.
+
+Each export is split into a body (the formatted terms, keyed only by the
+vocabulary digest and format) and a header with the company, industry and
+generation time. The app memoizes only the body; the header is added on every
+click, so a cached export never carries an old "Generated on" time.
+
+DOCX needs python-docx (optional); without it that format is not offered.
+"""
+import io
+import json
+import re
+
+try:
+    import docx
+except ImportError:
+    docx = None
+
+# format -> (label, file extension, MIME type)
+VOCAB_EXPORT_FORMATS = {
+    "txt": ("Text", "txt", "text/plain"),
+    "md": ("Markdown", "md", "text/markdown"),
+    "json": ("JSON (structured terms)", "json", "application/json"),
+}
+if docx is not None:
+    VOCAB_EXPORT_FORMATS["docx"] = (
+        "Word",
+        "docx",
+        "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    )
+
+_TERM_LINE = re.compile(r'^(\s*\d+\.\s+)([^:\n]+):\s*(.*)$')
+
+
+def _text_body(doc):
+    return doc.text
+
+
+def _text_export(body, account, industry, generated_on):
+    # Same layout as the original inline download
+    return f"""Vocabulary Export
+    Generated on: {generated_on}
+    Company: {account}
+    Industry: {industry}
+
+    {body}
+
+    ---
+    Generated by Vocabulary Analysis Tool
+    """
+
+
+def _markdown_body(doc):
+    if not doc.steps:
+        return doc.text
+    lines = []
+    preamble = doc.text[:doc.steps[0].start].strip()
+    if preamble:
+        lines += [preamble, ""]
+    for step in doc.steps:
+        lines.append(f"## {step.key}: {step.title}" if step.title else f"## {step.key}")
+        lines.append("")
+        body = doc.text[step.start:step.end].split("\n", 1)
+        for line in (body[1] if len(body) > 1 else "").strip().splitlines():
+            term = _TERM_LINE.match(line)
+            if term:
+                name = term.group(2).replace("**", "").strip()
+                line = f"{term.group(1).strip()} **{name}:** {term.group(3)}"
+            lines.append(line)
+        lines.append("")
+    return "\n".join(lines).rstrip("\n")
+
+
+def _markdown_export(body, account, industry, generated_on):
+    lines = [
+        "# Vocabulary Export",
+        "",
+        f"- **Generated on:** {generated_on}",
+        f"- **Company:** {account}",
+        f"- **Industry:** {industry}",
+        "",
+        body,
+        "",
+        "---",
+        "Generated by Vocabulary Analysis Tool",
+        "",
+    ]
+    return "\n".join(lines)
+
+
+def _json_body(doc):
+    return {
+        "digest": doc.digest,
+        "steps": [
+            {
+                "step": step.label,
+                "title": step.title,
+                "terms": [{"number": t.number, "name": t.name, "definition": t.definition} for t in step.terms],
+            }
+            for step in doc.steps
+        ],
+        "text": doc.text,
+    }
+
+
+def _json_export(body, account, industry, generated_on):
+    payload = {"company": account, "industry": industry, "generated_on": generated_on, **body}
+    return json.dumps(payload, ensure_ascii=False, indent=2)
+
+
+def _docx_body(doc):
+    document = docx.Document()
+    if not doc.steps:
+        for block in doc.text.split("\n\n"):
+            document.add_paragraph(block.strip())
+    for step in doc.steps:
+        document.add_heading(f"{step.key}: {step.title}" if step.title else step.key, level=2)
+        for term in step.terms:
+            paragraph = document.add_paragraph(style="List Number")
+            paragraph.add_run(f"{term.name}: ").bold = True
+            paragraph.add_run(term.definition)
+    document.add_paragraph("Generated by Vocabulary Analysis Tool")
+    out = io.BytesIO()
+    document.save(out)
+    return out.getvalue()
+
+
+def _docx_export(body, account, industry, generated_on):
+    # The body always ends with the footer paragraph, so there is a first paragraph to insert before
+    document = docx.Document(io.BytesIO(body))
+    first = document.paragraphs[0]
+    first.insert_paragraph_before("Vocabulary Export", style="Heading 1")
+    first.insert_paragraph_before(f"Generated on: {generated_on}\nCompany: {account}\nIndustry: {industry}")
+    out = io.BytesIO()
+    document.save(out)
+    return out.getvalue()
+
+
+# format -> (body builder, export builder)
+_BUILDERS = {
+    "txt": (_text_body, _text_export),
+    "md": (_markdown_body, _markdown_export),
+    "json": (_json_body, _json_export),
+    "docx": (_docx_body, _docx_export),
+}
+
+
+def _check_format(fmt):
+    if fmt not in VOCAB_EXPORT_FORMATS:
+        raise ValueError(f"Unsupported vocabulary export format: {fmt}")
+
+
+def build_vocab_body(doc, fmt):
+    """The expensive, header-free part of an export; only depends on (doc.digest, fmt), so it can be memoized"""
+    _check_format(fmt)
+    return _BUILDERS[fmt][0](doc)
+
+
+def build_vocab_export(doc, fmt, account, industry, generated_on, body=None):
+    """Bytes of the vocabulary in `fmt` (a key of VOCAB_EXPORT_FORMATS).
+
+    Pass a memoized build_vocab_body() result as `body` to only add the
+    header (company, industry, generation time) on top of it.
+    """
+    _check_format(fmt)
+    if body is None:
+        body = build_vocab_body(doc, fmt)
+    payload = _BUILDERS[fmt][1](body, account, industry, generated_on)
+    return payload.encode("utf-8") if isinstance(payload, str) else payload
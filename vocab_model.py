@@ -0,0 +1,145 @@
+"""Structured form of an extracted vocabulary.
+
+The vocabulary agency returns free text ('Step N: Title' headings followed by
+'1. Term: definition' lines). VocabularyDoc.from_text() parses it once into
+steps and terms that keep their character offsets into the text, so the
+feedback form, downloads and the renderer can work on the parsed data instead
+of re-scanning the string with regexes on every rerun.
+
+Documents serialize compactly to JSON (to_json/from_json) and, when the
+optional msgpack package is installed, to msgpack (to_msgpack/from_msgpack).
+"""
+import hashlib
+import json
+import re
+from dataclasses import dataclass, field
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+FORMAT_VERSION = 1
+
+_STEP_TITLE = re.compile(r'(Step\s*(\d+)\s*:\s*([^\n]+))', re.IGNORECASE)
+_STEP_BOUNDARY = re.compile(r'Step\s*(\d+)\s*:', re.IGNORECASE)
+_SUB_ITEM = re.compile(r'^\s*(\d+)\.\s+([^:\n]+)', re.MULTILINE)
+_ITEM_TAG = re.compile(r'<[^>]+>')
+_ITEM_BOLD = re.compile(r'\*\*([^*]+)\*\*')
+
+
+@dataclass(slots=True)
+class VocabTerm:
+    """A numbered '1. Term: definition' line; start/end are offsets into the text"""
+    number: int
+    name: str
+    definition: str
+    start: int
+    end: int
+
+    def to_list(self):
+        return [self.number, self.name, self.definition, self.start, self.end]
+
+
+@dataclass(slots=True)
+class VocabStep:
+    """A 'Step N:' section; start/end span the heading through the section body.
+
+    label is the step number exactly as written ('1', '01', ...); title is
+    None when no title text was found for the heading.
+    """
+    label: str
+    title: str
+    start: int
+    end: int
+    terms: list = field(default_factory=list)
+
+    @property
+    def key(self):
+        return f"Step {self.label}"
+
+    def to_list(self):
+        return [self.label, self.title, self.start, self.end, [t.to_list() for t in self.terms]]
+
+
+@dataclass(slots=True)
+class VocabularyDoc:
+    """Sanitized vocabulary text, its sha256 digest and the parsed steps"""
+    text: str
+    digest: str
+    steps: list = field(default_factory=list)
+
+    @classmethod
+    def from_text(cls, text):
+        """Parse sanitized vocabulary text into steps and terms (one pass over the text)"""
+        text = text or ""
+        doc = cls(text=text, digest=hashlib.sha256(text.encode("utf-8")).hexdigest())
+        if not text:
+            return doc
+
+        # A title match always starts on a step boundary; a title can swallow
+        # the next heading, in which case that heading gets no title.
+        titles = {m.start(): m.group(3).strip() for m in _STEP_TITLE.finditer(text)}
+        boundaries = list(_STEP_BOUNDARY.finditer(text))
+        for pos, match in enumerate(boundaries):
+            end = boundaries[pos + 1].start() if pos + 1 < len(boundaries) else len(text)
+            step = VocabStep(match.group(1), titles.get(match.start()), match.start(), end)
+            for sub_match in _SUB_ITEM.finditer(text, match.end(), end):
+                name = sub_match.group(2).strip()
+                name = _ITEM_TAG.sub('', name)
+                name = _ITEM_BOLD.sub(r'\1', name)
+                line_end = text.find("\n", sub_match.end(), end)
+                line_end = end if line_end == -1 else line_end
+                definition = text[sub_match.end():line_end].strip().lstrip(":").strip()
+                step.terms.append(VocabTerm(int(sub_match.group(1)), name, definition,
+                                            sub_match.start(), line_end))
+            doc.steps.append(step)
+        return doc
+
+    def step(self, key):
+        """The first step with this key ('Step 3'), or None"""
+        for step in self.steps:
+            if step.key == key:
+                return step
+        return None
+
+    def titles(self):
+        """{'Step N': title}; a repeated step number keeps its last title"""
+        return {step.key: step.title for step in self.steps if step.title is not None}
+
+    def term_names(self, key):
+        step = self.step(key)
+        return [term.name for term in step.terms] if step else []
+
+    # ---- serialization ----
+    def to_dict(self):
+        return {"v": FORMAT_VERSION, "text": self.text, "digest": self.digest,
+                "steps": [step.to_list() for step in self.steps]}
+
+    @classmethod
+    def from_dict(cls, data):
+        if data.get("v") != FORMAT_VERSION:
+            return cls.from_text(data.get("text", ""))
+        steps = [
+            VocabStep(label, title, start, end, [VocabTerm(*term) for term in terms])
+            for label, title, start, end, terms in data["steps"]
+        ]
+        return cls(text=data["text"], digest=data["digest"], steps=steps)
+
+    def to_json(self):
+        return json.dumps(self.to_dict(), ensure_ascii=False, separators=(",", ":"))
+
+    @classmethod
+    def from_json(cls, payload):
+        return cls.from_dict(json.loads(payload))
+
+    def to_msgpack(self):
+        if msgpack is None:
+            raise RuntimeError("msgpack is not installed; use to_json()")
+        return msgpack.packb(self.to_dict(), use_bin_type=True)
+
+    @classmethod
+    def from_msgpack(cls, payload):
+        if msgpack is None:
+            raise RuntimeError("msgpack is not installed; use from_json()")
+        return cls.from_dict(msgpack.unpackb(payload, raw=False))
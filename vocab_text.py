@@ -0,0 +1,113 @@
+"""Text helpers shared by the Streamlit app and the agency pipeline.
+
+Converts Talos agency responses to plain text and strips markdown/HTML
+artifacts from the LLM output.
+"""
+import re
+
+
+def json_to_text(data):
+    if data is None: 
+        return ""
+    if isinstance(data, str): 
+        return data
+    if isinstance(data, dict):
+        for key in ("result", "output", "content", "text"):
+            if key in data and data[key]: 
+                return json_to_text(data[key])
+        if "data" in data: 
+            return json_to_text(data["data"])
+        return "\n".join(f"{k}: {json_to_text(v)}" for k, v in data.items() if v)
+    if isinstance(data, list): 
+        return "\n".join(json_to_text(x) for x in data if x)
+    return str(data)
+
+# Precompiled sanitizer passes (applied in this order by sanitize_text).
+# Quantifiers are spelled with a literal first character ('##*' rather than
+# '#+', '\n\n\n+' rather than '\n{3,}') so the regex engine can use its fast
+# literal-prefix search; the matches are identical.
+_STRAY_S_LINE = re.compile(r'\n\s*s\s+')
+_QA_LABEL = re.compile(r'Q\d+\s*Answer\s*Explanation\s*:', re.IGNORECASE)
+_BOLD = re.compile(r'\*\*(.*?)\*\*')
+_ITALIC = re.compile(r'\*(.*?)\*')
+_CODE = re.compile(r'`(.*?)`')
+_HEADING_HASHES = re.compile(r'##*\s*')
+_IMAGE = re.compile(r'!\[.*?\]\(.*?\)')
+_LINK = re.compile(r'\[(.*?)\]\(.*?\)')
+_BLANK_LINES = re.compile(r'\n\n\n+')
+_SPACE_RUNS = re.compile(r'  +')
+_BULLET = re.compile(r'^\s*[-*]\s+', re.MULTILINE)
+_HTML_TAG = re.compile(r'<\/?[^>]+>')
+
+
+def sanitize_text(text):
+    """Remove markdown artifacts and clean up text.
+
+    The passes feed into each other (e.g. '***a***' needs both the bold and
+    the italic pass), so they cannot be fused into one regex without changing
+    output. Instead every pass is precompiled and skipped outright when the
+    text it needs is absent, which most passes are on typical output.
+    benchmarks/bench_sanitize.py checks the output against the original
+    implementation.
+    """
+    if not text:
+        return ""
+
+    # Fix the "s" character issue - remove stray 's' characters at the beginning
+    text = text.strip()
+    if text[:1] == "s" and text[1:2].isspace():
+        text = text[1:].lstrip()
+    text = _STRAY_S_LINE.sub('\n', text)
+
+    # 'answer' must appear (case-folded) for the Q&A label pattern to match
+    if 'answer' in text.casefold():
+        text = _QA_LABEL.sub('', text)
+    if '*' in text:
+        text = _BOLD.sub(r'\1', text)
+        text = _ITALIC.sub(r'\1', text)
+    if '`' in text:
+        text = _CODE.sub(r'\1', text)
+    if '#' in text:
+        text = _HEADING_HASHES.sub('', text)
+    if '](' in text:
+        if '![' in text:
+            text = _IMAGE.sub('', text)
+        text = _LINK.sub(r'\1', text)
+    if '\n\n\n' in text:
+        text = _BLANK_LINES.sub('\n\n', text)
+    if '  ' in text:
+        text = _SPACE_RUNS.sub(' ', text)
+    if '-' in text or '*' in text:
+        text = _BULLET.sub('• ', text)
+    if '<' in text:
+        text = _HTML_TAG.sub('', text)
+    text = text.replace('& Key Takeaway:', 'Key Takeaway:')
+
+    return text.strip()
+
+
+_PARAGRAPH_BREAK = re.compile(r'\n[ \t]*\n|\n(?=Step\s*\d+\s*:)', re.IGNORECASE)
+
+
+class ParagraphAccumulator:
+    """Collect streamed text and hand back paragraphs as soon as they are complete.
+
+    A paragraph ends at a blank line or right before a new 'Step N:' heading,
+    which is where the formatter starts a new block anyway.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+
+    def feed(self, chunk):
+        """Add a chunk; return the list of paragraphs it completed"""
+        self._buffer += chunk
+        parts = _PARAGRAPH_BREAK.split(self._buffer)
+        self._buffer = parts.pop()
+        return [p for p in parts if p.strip()]
+
+    def flush(self):
+        """Return whatever is left once the stream has ended"""
+        rest, self._buffer = self._buffer, ""
+        return [rest] if rest.strip() else []
+